@@ -4,6 +4,7 @@ Allows admins to upload and parse P6 schedule CSV files
 """
 
 import streamlit as st
+from datetime import datetime
 from src.database.db_manager import DatabaseManager
 from src.auth.auth_manager import AuthManager
 from src.parsers.schedule_parser import ScheduleParser
@@ -17,6 +18,15 @@ from src.utils.helpers import (
 
 st.set_page_config(page_title="Upload Schedule", page_icon="📤", layout="wide")
 
+
+@st.cache_data(ttl=24 * 60 * 60, max_entries=8, show_spinner=False)
+def parse_schedule(file_content: bytes, file_name: str):
+    """Parse an uploaded CSV, reusing the result when the same file is submitted again"""
+    parser = ScheduleParser()
+    schedule_data = parser.parse_csv(file_content, file_name)
+    return schedule_data, parser.df
+
+
 # Initialize
 init_session_state()
 db = DatabaseManager()
@@ -147,9 +157,10 @@ if analyze_button:
             status_text.text("📄 Parsing CSV file...")
             progress_bar.progress(20)
 
-            parser = ScheduleParser()
             file_content = uploaded_file.getvalue()
-            schedule_data = parser.parse_csv(file_content, uploaded_file.name)
+            schedule_data, schedule_df = parse_schedule(file_content, uploaded_file.name)
+            # A cached parse keeps its original timestamp - stamp this upload
+            schedule_data['upload_date'] = datetime.now().isoformat()
 
             if not schedule_data.get('success', False):
                 display_error_message("Failed to parse CSV file:")
@@ -179,7 +190,7 @@ if analyze_button:
             # Step 3: Run DCMA analysis
             status_text.text("🔍 Running DCMA analysis...")
 
-            analyzer = DCMAAnalyzer(schedule_data)
+            analyzer = DCMAAnalyzer(schedule_data, df=schedule_df)
             dcma_results = analyzer.analyze()
 
             progress_bar.progress(70)
@@ -187,7 +198,7 @@ if analyze_button:
             # Step 4: Calculate performance metrics
             status_text.text("📊 Calculating performance metrics...")
 
-            metrics_calc = MetricsCalculator(schedule_data, dcma_results['metrics'])
+            metrics_calc = MetricsCalculator(schedule_data, dcma_results['metrics'], df=schedule_df)
             performance_metrics = metrics_calc.calculate_all_metrics()
 
             # Generate DCMA 14-Point Summary
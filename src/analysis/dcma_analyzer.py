@@ -3,103 +3,373 @@ DCMA 14-Point Schedule Assessment Analyzer
 Implements industry-standard schedule quality metrics
 """
 
+import copy
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 
+# Right-closed Total Float bucket edges for np.digitize:
+# 0 = negative (< 0), 1 = critical (= 0), 2 = near-critical (0, 10],
+# 3 = low risk (10, 30], 4 = comfortable (> 30)
+FLOAT_BIN_EDGES = np.array([np.nextafter(0.0, -1.0), 0.0, 10.0, 30.0])
+
+# Low-cardinality text columns stored as categoricals (int codes for ==, str and groupby).
+# Categories keep first-seen order so tied counts come out in the same order as value_counts.
+CATEGORICAL_COLUMNS = [
+    'Activity Type', 'Activity Status', 'constraint_category', 'Primary Constraint', 'Resource Names'
+]
+
+# Columns read by the per-activity analyses; cached as numpy arrays at init
+HOT_COLUMNS = [
+    'Activity ID', 'Activity Name', 'Activity Status', 'Activity Type',
+    'Total Float', 'At Completion Duration', 'WBS Code',
+    'missing_predecessor', 'missing_successor', 'missing_logic'
+]
+
+
+@dataclass(slots=True)
+class Issue:
+    """A schedule quality issue found during analysis"""
+    category: str
+    severity: str
+    title: str
+    description: str
+    count: int
+    recommendation: str
+    affected_activities: Optional[List] = None
+
+    def to_dict(self) -> Dict:
+        """Dictionary form used by the results payload (no affected_activities key when not set)"""
+        issue = {
+            'category': self.category,
+            'severity': self.severity,
+            'title': self.title,
+            'description': self.description,
+            'count': self.count,
+            'recommendation': self.recommendation
+        }
+        if self.affected_activities is not None:
+            issue['affected_activities'] = self.affected_activities
+        return issue
+
+
+# Metrics reported when an analysis step's required columns are not in the export
+UNAVAILABLE_METRICS = {
+    'long_durations': {
+        'count_over_20_days': 0,
+        'count_over_5_months': 0,
+        'activities_20_days': [],
+        'activities_5_months': []
+    },
+    'dcma_long_durations': {
+        'count': 0,
+        'percentage': 0,
+        'total_analyzed': 0,
+        'activities': [],
+        'threshold': 44,
+        'target': 5.0,
+        'status': 'unknown',
+        'error': 'At Completion Duration column not available'
+    },
+    'dcma_high_float': {
+        'count': 0,
+        'percentage': 0,
+        'total_analyzed': 0,
+        'activities': [],
+        'threshold': 44,
+        'target': 5.0,
+        'status': 'unknown',
+        'error': 'Total Float column not available'
+    },
+    'dcma_invalid_dates': {
+        'count': 0,
+        'activities': [],
+        'target': 0,
+        'status': 'unknown',
+        'error': 'Start/Finish date columns not available'
+    },
+    'dcma_missing_resources': {
+        'count': 0,
+        'percentage': 0,
+        'total_incomplete': 0,
+        'activities': [],
+        'target': 5.0,
+        'status': 'n/a',
+        'result_text': 'N/A - Resource data not in export'
+    },
+    'dcma_missing_predecessors': {
+        'count': 0,
+        'activities': [],
+        'target': 1,
+        'status': 'pass',
+        'result_text': '0 activities (Target: ≤1)'
+    },
+    'dcma_missing_successors': {
+        'count': 0,
+        'activities': [],
+        'target': 1,
+        'status': 'pass',
+        'result_text': '0 activities (Target: ≤1)'
+    },
+    'float_ratio': {'ratio': 0.0, 'status': 'unknown'},
+    'activity_distribution': {'by_month': {}, 'total_months': 0}
+}
+
+# Analysis steps in run order: (method name, required columns, metric reported when skipped).
+# Steps without a metric key always run - they report dataset-dependent fallbacks themselves.
+ANALYSIS_STEPS = [
+    # Logic and Network Integrity
+    ('_analyze_negative_lags', (), None),
+    ('_analyze_positive_lags', (), None),
+    ('_analyze_hard_constraints', (), None),
+    ('_analyze_missing_logic', (), None),
+    ('_analyze_open_ends', (), None),
+
+    # DCMA-specific metrics
+    ('_analyze_negative_float', (), None),  # DCMA #5
+    ('_analyze_missing_predecessors', ('missing_predecessor',), 'dcma_missing_predecessors'),  # DCMA #6
+    ('_analyze_missing_successors', ('missing_successor',), 'dcma_missing_successors'),  # DCMA #7
+    ('_analyze_invalid_dates', ('Start', 'Finish'), 'dcma_invalid_dates'),  # DCMA #9
+    ('_analyze_high_float_dcma', ('Total Float',), 'dcma_high_float'),  # DCMA #4 - High Float (>44 days)
+
+    # Duration Analysis
+    ('_analyze_long_durations', ('At Completion Duration',), 'long_durations'),
+    ('_analyze_long_durations_dcma', ('At Completion Duration',), 'dcma_long_durations'),  # DCMA #8
+    ('_analyze_average_duration', (), None),
+
+    # Float Analysis
+    ('_analyze_high_float', (), None),
+    ('_analyze_float_ratio', ('Total Float',), 'float_ratio'),
+    ('_analyze_comprehensive_float', (), None),  # Comprehensive float analysis with all KPIs
+
+    # Activity Distribution
+    ('_analyze_activity_distribution', ('Start', 'Finish'), 'activity_distribution'),
+
+    # Resource Analysis
+    ('_analyze_resource_assignment', (), None),
+    ('_analyze_missing_resources_dcma', ('Resource Names',), 'dcma_missing_resources'),  # DCMA #10
+
+    # Milestone Validation
+    ('_analyze_milestones', (), None),
+
+    # Activity Types
+    ('_analyze_activity_types', (), None),
+
+    # Relationship Types
+    ('_analyze_relationship_types', (), None),
+    ('_analyze_ss_ff_relationships', (), None),  # DCMA #11
+
+    # Status Analysis
+    ('_analyze_activity_status', (), None),
+
+    # WBS Analysis (if WBS data available)
+    ('_analyze_wbs_structure', (), None)
+]
+
+
+def _duration_stats(durations: np.ndarray, mask: np.ndarray) -> Dict:
+    """
+    Compute duration statistics and long-duration buckets in one place
+
+    Args:
+        durations: Activity durations (float array, NaN for missing)
+        mask: Boolean array selecting the activities to analyze
+
+    Returns:
+        Dictionary with count, mean, median, min, max and the row indices of
+        activities over 20 days (long_idx) and over 150 days (very_long_idx)
+    """
+    idx = np.flatnonzero(mask)
+    values = durations[idx]
+
+    if len(values) > 0:
+        mean = float(values.mean())
+        # Median via partition on a scratch copy (avoids a full sort)
+        scratch = values.copy()
+        mid = len(scratch) // 2
+        if len(scratch) % 2:
+            median = float(np.partition(scratch, mid)[mid])
+        else:
+            part = np.partition(scratch, [mid - 1, mid])
+            median = float((part[mid - 1] + part[mid]) / 2)
+        minimum = float(values.min())
+        maximum = float(values.max())
+    else:
+        mean = median = minimum = maximum = 0.0
+
+    very_long_mask = values > 150  # ~5 months
+    long_mask = ~very_long_mask & (values > 20)
+
+    return {
+        'count': len(values),
+        'mean': mean,
+        'median': median,
+        'min': minimum,
+        'max': maximum,
+        'long_idx': idx[long_mask],
+        'very_long_idx': idx[very_long_mask]
+    }
+
+
 class DCMAAnalyzer:
     """
     Analyzes schedules based on DCMA 14-Point Assessment
     and GAO Schedule Assessment Guide best practices
     """
 
-    def __init__(self, schedule_data: Dict):
+    def __init__(self, schedule_data: Dict, df: Optional[pd.DataFrame] = None):
         """
         Initialize analyzer with schedule data
 
         Args:
             schedule_data: Parsed schedule data from ScheduleParser
+            df: Activities DataFrame already built for this schedule (e.g. ScheduleParser.df).
+                Built from schedule_data['activities'] when not provided.
         """
         self.schedule_data = schedule_data
-        self.df = pd.DataFrame(schedule_data['activities'])
+        # A caller's frame is shallow-copied so the categorical columns below stay local to the analyzer.
+        # A header-only export's frame still carries every column; build from the empty activities
+        # list instead so the analyses report the columns as unavailable, as before
+        if df is not None and len(df):
+            self.df = df.copy(deep=False)
+        else:
+            self.df = pd.DataFrame(schedule_data['activities'])
+        for col in CATEGORICAL_COLUMNS:
+            if col in self.df.columns:
+                values = self.df[col]
+                self.df[col] = pd.Categorical(values, categories=values.dropna().unique())
         self.metrics = {}
         self.issues = []
         self.warnings = []
 
-    def analyze(self) -> Dict:
-        """
-        Run complete DCMA analysis
-        Returns comprehensive metrics dictionary
-        """
-        # Logic and Network Integrity
-        self._analyze_negative_lags()
-        self._analyze_positive_lags()
-        self._analyze_hard_constraints()
-        self._analyze_missing_logic()
-        self._analyze_open_ends()
+        # Column presence is checked once here rather than inside every analysis step
+        self._available = frozenset(self.df.columns)
 
-        # DCMA-specific metrics
-        self._analyze_negative_float()  # DCMA #5
-        self._analyze_missing_predecessors()  # DCMA #6
-        self._analyze_missing_successors()  # DCMA #7
-        self._analyze_invalid_dates()  # DCMA #9
-        self._analyze_high_float_dcma()  # DCMA #4 - High Float (>44 days)
+        # Project duration (days) is shared by several float analyses - compute once
+        self._project_duration = 0
+        if 'Start' in self._available and 'Finish' in self._available:
+            span = self.df['Finish'].max() - self.df['Start'].min()
+            if pd.notna(span):
+                self._project_duration = int(span.days)
 
-        # Duration Analysis
-        self._analyze_long_durations()
-        self._analyze_long_durations_dcma()  # DCMA #8 - Long Duration (>44 days)
-        self._analyze_average_duration()
+        # Column-oriented view of the hot columns (avoids per-row pandas access)
+        self._cols = {
+            name: self.df[name].to_numpy()
+            for name in HOT_COLUMNS if name in self._available
+        }
 
-        # Float Analysis
-        self._analyze_high_float()
-        self._analyze_float_ratio()
-        self._analyze_comprehensive_float()  # NEW - Comprehensive float analysis with all KPIs
+        # Total Float as float64 with a validity mask, shared by all float KPIs
+        if 'Total Float' in self._available:
+            self._tf = pd.to_numeric(self.df['Total Float'], errors='coerce').to_numpy(dtype=np.float64)
+            self._tf_valid = ~np.isnan(self._tf)
+        else:
+            self._tf = None
+            self._tf_valid = None
 
-        # Activity Distribution
-        self._analyze_activity_distribution()
+        # WBS code as display strings ('nan' for blanks, 'N/A' when the column is absent)
+        if 'WBS Code' in self._available:
+            self._wbs_str = self.df['WBS Code'].astype(str).to_numpy()
+        else:
+            self._wbs_str = np.full(len(self.df), 'N/A', dtype=object)
 
-        # Resource Analysis
-        self._analyze_resource_assignment()
-        self._analyze_missing_resources_dcma()  # DCMA #10
+        # Milestone mask and clean duration array, shared by the duration analyses
+        if 'Activity Type' in self._available:
+            self._is_milestone = self.df['Activity Type'].str.contains(
+                'Milestone', case=False, na=False
+            ).to_numpy(dtype=bool)
+        else:
+            self._is_milestone = np.zeros(len(self.df), dtype=bool)
+
+        if 'At Completion Duration' in self._available:
+            self._dur_arr = pd.to_numeric(
+                self.df['At Completion Duration'], errors='coerce'
+            ).to_numpy(dtype=np.float64)
+            self._dur_valid = ~np.isnan(self._dur_arr) & (self._dur_arr > 0)
+            # Non-milestone statistics are shared by the long/average duration analyses
+            self._dur_stats = _duration_stats(self._dur_arr, self._dur_valid & ~self._is_milestone)
+        else:
+            self._dur_arr = None
+            self._dur_valid = None
+            self._dur_stats = None
 
-        # Milestone Validation
-        self._analyze_milestones()
+        # Incomplete-activity mask shared by the DCMA checks
+        if 'Activity Status' in self._available:
+            self._incomplete = (self.df['Activity Status'] != 'Completed').to_numpy(dtype=bool)
+        else:
+            self._incomplete = np.ones(len(self.df), dtype=bool)
+
+        # Flat relationships table (one row per predecessor link) shared by the logic analyses
+        self._rels = self._build_relationships()
 
-        # Activity Types
-        self._analyze_activity_types()
+    def _col(self, name: str, default=None) -> np.ndarray:
+        """
+        Get a hot column as a numpy array
+
+        Args:
+            name: Column name (one of HOT_COLUMNS)
+            default: Fill value used when the column is not present
 
-        # Relationship Types
-        self._analyze_relationship_types()
-        self._analyze_ss_ff_relationships()  # DCMA #11
+        Returns:
+            Column values, or an object array filled with default
+        """
+        if name in self._cols:
+            return self._cols[name]
+        return np.full(len(self.df), default, dtype=object)
+
+    def _build_relationships(self) -> pd.DataFrame:
+        """
+        Explode predecessor_list into one row per relationship
 
-        # Status Analysis
-        self._analyze_activity_status()
+        Returns:
+            DataFrame with activity_id, activity_name, predecessor, type and lag columns
+        """
+        columns = ['activity_id', 'activity_name', 'predecessor', 'type', 'lag']
+        if 'predecessor_list' not in self._available or self.df.empty:
+            return pd.DataFrame(columns=columns)
+
+        exploded = self.df[['Activity ID', 'Activity Name', 'predecessor_list']].explode('predecessor_list')
+        exploded = exploded.dropna(subset=['predecessor_list'])
+        if exploded.empty:
+            return pd.DataFrame(columns=columns)
+
+        details = pd.json_normalize(exploded['predecessor_list'].tolist())
+        details.index = exploded.index
+
+        rels = pd.DataFrame({
+            'activity_id': exploded['Activity ID'],
+            'activity_name': exploded['Activity Name'],
+            'predecessor': details['activity'] if 'activity' in details else None,
+            'type': details['type'].fillna('FS') if 'type' in details else 'FS',
+            'lag': details['lag'].fillna(0) if 'lag' in details else 0
+        })
+        return rels.reset_index(drop=True)
 
-        # WBS Analysis (if WBS data available)
-        self._analyze_wbs_structure()
+    def analyze(self) -> Dict:
+        """
+        Run complete DCMA analysis
+        Returns comprehensive metrics dictionary
+        """
+        for method_name, required, metric_key in ANALYSIS_STEPS:
+            if metric_key is None or self._available.issuperset(required):
+                getattr(self, method_name)()
+            else:
+                # Required input missing - report the unavailable metric without running the step
+                self.metrics[metric_key] = copy.deepcopy(UNAVAILABLE_METRICS[metric_key])
 
         return {
             'metrics': self.metrics,
-            'issues': self.issues
+            'issues': [issue.to_dict() for issue in self.issues]
         }
 
     def _analyze_negative_lags(self):
         """Analyze negative lags (leads)"""
-        negative_lags = []
-
-        for idx, row in self.df.iterrows():
-            predecessors = row.get('predecessor_list', [])
-            for pred in predecessors:
-                if pred.get('lag', 0) < 0:
-                    negative_lags.append({
-                        'activity_id': row['Activity ID'],
-                        'activity_name': row['Activity Name'],
-                        'predecessor': pred['activity'],
-                        'relationship_type': pred['type'],
-                        'lag': pred['lag']
-                    })
+        rels = self._rels
+        negative = rels.loc[rels['lag'] < 0]
+        negative_lags = negative.rename(columns={'type': 'relationship_type'}).to_dict('records')
+        negative_ids = negative['activity_id'].tolist()
 
         self.metrics['negative_lags'] = {
             'count': len(negative_lags),
@@ -109,34 +379,23 @@ class DCMAAnalyzer:
         }
 
         if len(negative_lags) > 0:
-            self.issues.append({
-                'category': 'Logic Quality',
-                'severity': 'high',
-                'title': f'Negative Lags Detected: {len(negative_lags)}',
-                'description': 'Negative lags (leads) indicate activities starting before predecessors finish, which may indicate schedule compression or logic errors.',
-                'count': len(negative_lags),
-                'recommendation': 'Review and eliminate negative lags. Consider using appropriate relationship types (FS, FF, SS, SF) instead of leads.',
-                'affected_activities': [nl['activity_id'] for nl in negative_lags]
-            })
+            self.issues.append(Issue(
+                category='Logic Quality',
+                severity='high',
+                title=f'Negative Lags Detected: {len(negative_lags)}',
+                description='Negative lags (leads) indicate activities starting before predecessors finish, which may indicate schedule compression or logic errors.',
+                count=len(negative_lags),
+                recommendation='Review and eliminate negative lags. Consider using appropriate relationship types (FS, FF, SS, SF) instead of leads.',
+                affected_activities=negative_ids
+            ))
 
     def _analyze_positive_lags(self):
         """Analyze positive lags"""
-        positive_lags = []
-        total_relationships = 0
-
-        for idx, row in self.df.iterrows():
-            predecessors = row.get('predecessor_list', [])
-            total_relationships += len(predecessors)
-
-            for pred in predecessors:
-                if pred.get('lag', 0) > 0:
-                    positive_lags.append({
-                        'activity_id': row['Activity ID'],
-                        'activity_name': row['Activity Name'],
-                        'predecessor': pred['activity'],
-                        'relationship_type': pred['type'],
-                        'lag': pred['lag']
-                    })
+        rels = self._rels
+        total_relationships = len(rels)
+        positive = rels.loc[rels['lag'] > 0]
+        positive_lags = positive.rename(columns={'type': 'relationship_type'}).to_dict('records')
+        positive_ids = positive['activity_id'].tolist()
 
         percentage = (len(positive_lags) / total_relationships * 100) if total_relationships > 0 else 0
 
@@ -150,15 +409,15 @@ class DCMAAnalyzer:
         }
 
         if percentage > 5.0:
-            self.issues.append({
-                'category': 'Logic Quality',
-                'severity': 'medium',
-                'title': f'Excessive Positive Lags: {percentage:.1f}%',
-                'description': f'Found {len(positive_lags)} positive lags ({percentage:.1f}% of relationships). Target is ≤5%.',
-                'count': len(positive_lags),
-                'recommendation': 'Review positive lags to ensure they represent actual waiting time. Consider creating separate activities for waiting periods.',
-                'affected_activities': [pl['activity_id'] for pl in positive_lags]
-            })
+            self.issues.append(Issue(
+                category='Logic Quality',
+                severity='medium',
+                title=f'Excessive Positive Lags: {percentage:.1f}%',
+                description=f'Found {len(positive_lags)} positive lags ({percentage:.1f}% of relationships). Target is ≤5%.',
+                count=len(positive_lags),
+                recommendation='Review positive lags to ensure they represent actual waiting time. Consider creating separate activities for waiting periods.',
+                affected_activities=positive_ids
+            ))
 
     def _analyze_hard_constraints(self):
         """Analyze constraints - ALL types including ALAP"""
@@ -172,8 +431,10 @@ class DCMAAnalyzer:
             'Other': []
         }
         all_constrained_activities = []
+        # Activity IDs per category, collected alongside the records for the issues
+        constraint_ids = {category: [] for category in constraints_by_category}
 
-        if 'constraint_category' in self.df.columns:
+        if 'constraint_category' in self._available:
             # Get all activities with ANY constraint (not 'None')
             constrained = self.df[self.df['has_any_constraint'] == True]
 
@@ -191,6 +452,7 @@ class DCMAAnalyzer:
                 category = row.get('constraint_category', 'Other')
                 if category in constraints_by_category:
                     constraints_by_category[category].append(constraint_info)
+                    constraint_ids[category].append(constraint_info['activity_id'])
 
         # Calculate percentages
         total_constrained = len(all_constrained_activities)
@@ -250,39 +512,39 @@ class DCMAAnalyzer:
         # Create issues for excessive constraints
         # Hard constraints should be minimal
         if hard_percentage > 10.0:
-            self.issues.append({
-                'category': 'Schedule Flexibility',
-                'severity': 'high',
-                'title': f'Excessive Hard Constraints: {hard_percentage:.1f}%',
-                'description': f'Found {hard_count} hard date constraints ({hard_percentage:.1f}% of activities). Hard constraints (Must/On dates) significantly reduce schedule flexibility and should be minimized.',
-                'count': hard_count,
-                'recommendation': 'Review and remove unnecessary hard date constraints. Use logic-driven scheduling instead. Each constraint should be duly justified by contractual or regulatory requirements.',
-                'affected_activities': [c['activity_id'] for c in constraints_by_category['Hard']]
-            })
+            self.issues.append(Issue(
+                category='Schedule Flexibility',
+                severity='high',
+                title=f'Excessive Hard Constraints: {hard_percentage:.1f}%',
+                description=f'Found {hard_count} hard date constraints ({hard_percentage:.1f}% of activities). Hard constraints (Must/On dates) significantly reduce schedule flexibility and should be minimized.',
+                count=hard_count,
+                recommendation='Review and remove unnecessary hard date constraints. Use logic-driven scheduling instead. Each constraint should be duly justified by contractual or regulatory requirements.',
+                affected_activities=constraint_ids['Hard']
+            ))
 
         # Flexible constraints warning
         if flexible_percentage > 15.0:
-            self.issues.append({
-                'category': 'Schedule Flexibility',
-                'severity': 'medium',
-                'title': f'High Flexible Constraints: {flexible_percentage:.1f}%',
-                'description': f'Found {flexible_count} flexible date constraints ({flexible_percentage:.1f}% of activities). These "On or Before/After" constraints limit scheduling flexibility.',
-                'count': flexible_count,
-                'recommendation': 'Review flexible constraints and remove those that are not duly justified. Consider using logic relationships instead.',
-                'affected_activities': [c['activity_id'] for c in constraints_by_category['Flexible']]
-            })
+            self.issues.append(Issue(
+                category='Schedule Flexibility',
+                severity='medium',
+                title=f'High Flexible Constraints: {flexible_percentage:.1f}%',
+                description=f'Found {flexible_count} flexible date constraints ({flexible_percentage:.1f}% of activities). These "On or Before/After" constraints limit scheduling flexibility.',
+                count=flexible_count,
+                recommendation='Review flexible constraints and remove those that are not duly justified. Consider using logic relationships instead.',
+                affected_activities=constraint_ids['Flexible']
+            ))
 
         # Schedule-driven informational (if very high)
         if schedule_driven_percentage > 50.0:
-            self.issues.append({
-                'category': 'Schedule Setup',
-                'severity': 'low',
-                'title': f'High Schedule-Driven Constraints: {schedule_driven_percentage:.1f}%',
-                'description': f'Found {schedule_driven_count} schedule-driven constraints ({schedule_driven_percentage:.1f}% of activities). While ALAP/ASAP are not date constraints, high usage may indicate over-reliance on these settings.',
-                'count': schedule_driven_count,
-                'recommendation': 'Review schedule-driven constraints. Consider if activities should be unconstrained to allow more schedule flexibility.',
-                'affected_activities': [c['activity_id'] for c in constraints_by_category['Schedule-Driven']]
-            })
+            self.issues.append(Issue(
+                category='Schedule Setup',
+                severity='low',
+                title=f'High Schedule-Driven Constraints: {schedule_driven_percentage:.1f}%',
+                description=f'Found {schedule_driven_count} schedule-driven constraints ({schedule_driven_percentage:.1f}% of activities). While ALAP/ASAP are not date constraints, high usage may indicate over-reliance on these settings.',
+                count=schedule_driven_count,
+                recommendation='Review schedule-driven constraints. Consider if activities should be unconstrained to allow more schedule flexibility.',
+                affected_activities=constraint_ids['Schedule-Driven']
+            ))
 
     def _analyze_missing_logic(self):
         """Analyze activities with missing predecessors or successors"""
@@ -290,20 +552,27 @@ class DCMAAnalyzer:
         missing_pred_only = []
         missing_succ_only = []
         missing_both = []
+        missing_ids = []
 
-        if 'missing_logic' in self.df.columns:
-            missing = self.df[self.df['missing_logic'] == True]
+        if 'missing_logic' in self._cols:
+            positions = np.flatnonzero(self._cols['missing_logic'] == True)
+            missing_ids = self._col('Activity ID')[positions].tolist()
 
-            for idx, row in missing.iterrows():
-                has_missing_pred = row.get('missing_predecessor', False)
-                has_missing_succ = row.get('missing_successor', False)
+            rows = zip(
+                missing_ids,
+                self._col('Activity Name')[positions].tolist(),
+                self._col('missing_predecessor', False)[positions].tolist(),
+                self._col('missing_successor', False)[positions].tolist(),
+                self._col('Activity Status', 'Unknown')[positions].tolist()
+            )
 
+            for activity_id, activity_name, has_missing_pred, has_missing_succ, status in rows:
                 activity_info = {
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
+                    'activity_id': activity_id,
+                    'activity_name': activity_name,
                     'missing_predecessor': has_missing_pred,
                     'missing_successor': has_missing_succ,
-                    'status': row.get('Activity Status', 'Unknown')
+                    'status': status
                 }
 
                 missing_logic.append(activity_info)
@@ -330,26 +599,21 @@ class DCMAAnalyzer:
         }
 
         if len(missing_logic) > 0:
-            self.issues.append({
-                'category': 'Logic Completeness',
-                'severity': 'high',
-                'title': f'Missing Logic: {len(missing_logic)} activities',
-                'description': 'Activities without predecessors or successors indicate incomplete schedule logic.',
-                'count': len(missing_logic),
-                'recommendation': 'Add logical relationships to all activities. Every activity (except start/finish milestones) should have both predecessors and successors.',
-                'affected_activities': [ml['activity_id'] for ml in missing_logic]
-            })
+            self.issues.append(Issue(
+                category='Logic Completeness',
+                severity='high',
+                title=f'Missing Logic: {len(missing_logic)} activities',
+                description='Activities without predecessors or successors indicate incomplete schedule logic.',
+                count=len(missing_logic),
+                recommendation='Add logical relationships to all activities. Every activity (except start/finish milestones) should have both predecessors and successors.',
+                affected_activities=missing_ids
+            ))
 
     def _analyze_open_ends(self):
         """Analyze open-ended activities"""
-        open_starts = []
-        open_finishes = []
-
-        for idx, row in self.df.iterrows():
-            if row.get('missing_predecessor', False):
-                open_starts.append(row['Activity ID'])
-            if row.get('missing_successor', False):
-                open_finishes.append(row['Activity ID'])
+        activity_ids = self._col('Activity ID')
+        open_starts = activity_ids[self._col('missing_predecessor', False).astype(bool)].tolist()
+        open_finishes = activity_ids[self._col('missing_successor', False).astype(bool)].tolist()
 
         self.metrics['open_ends'] = {
             'open_starts': len(open_starts),
@@ -365,33 +629,17 @@ class DCMAAnalyzer:
         """Analyze activities with long durations"""
         long_activities = []
         very_long_activities = []
+        very_long_ids = []
 
         # Use At Completion Duration (P6 work days) - REQUIRED
         duration_col = 'At Completion Duration'
 
-        if duration_col in self.df.columns:
-            # Filter out milestones - they have duration = 0 by nature
-            # Check Activity Type for milestone indicators
-            non_milestone_df = self.df.copy()
-            if 'Activity Type' in self.df.columns:
-                # Exclude activities where Activity Type contains "Milestone" (case insensitive)
-                non_milestone_df = self.df[~self.df['Activity Type'].str.contains('Milestone', case=False, na=False)]
-
-            for idx, row in non_milestone_df.iterrows():
-                duration = row.get(duration_col, 0)
-                if pd.notna(duration) and duration > 0:  # Exclude zero-duration activities
-                    if duration > 150:  # ~5 months
-                        very_long_activities.append({
-                            'activity_id': row['Activity ID'],
-                            'activity_name': row['Activity Name'],
-                            'duration': int(duration)
-                        })
-                    elif duration > 20:
-                        long_activities.append({
-                            'activity_id': row['Activity ID'],
-                            'activity_name': row['Activity Name'],
-                            'duration': int(duration)
-                        })
+        if duration_col in self._available:
+            # Milestones and zero/missing durations are already excluded from the stats
+            very_long_idx = self._dur_stats['very_long_idx']
+            very_long_activities = self._duration_records(very_long_idx)
+            very_long_ids = self._col('Activity ID')[very_long_idx].tolist()
+            long_activities = self._duration_records(self._dur_stats['long_idx'])
 
         self.metrics['long_durations'] = {
             'count_over_20_days': len(long_activities) + len(very_long_activities),
@@ -401,48 +649,39 @@ class DCMAAnalyzer:
         }
 
         if len(very_long_activities) > 0:
-            self.issues.append({
-                'category': 'Schedule Granularity',
-                'severity': 'medium',
-                'title': f'Very Long Duration Activities: {len(very_long_activities)}',
-                'description': f'Found {len(very_long_activities)} activities exceeding 5 months duration (excluding milestones).',
-                'count': len(very_long_activities),
-                'recommendation': 'Break down long duration activities into smaller, manageable tasks (target: 10-20 days).',
-                'affected_activities': [vla['activity_id'] for vla in very_long_activities]
-            })
+            self.issues.append(Issue(
+                category='Schedule Granularity',
+                severity='medium',
+                title=f'Very Long Duration Activities: {len(very_long_activities)}',
+                description=f'Found {len(very_long_activities)} activities exceeding 5 months duration (excluding milestones).',
+                count=len(very_long_activities),
+                recommendation='Break down long duration activities into smaller, manageable tasks (target: 10-20 days).',
+                affected_activities=very_long_ids
+            ))
+
+    def _duration_records(self, positions: np.ndarray) -> List[Dict]:
+        """Build activity_id/activity_name/duration records for the given row positions"""
+        records = self.df.iloc[positions][['Activity ID', 'Activity Name']].rename(
+            columns={'Activity ID': 'activity_id', 'Activity Name': 'activity_name'}
+        )
+        records['duration'] = self._dur_arr[positions].astype(int)
+        return records.to_dict('records')
 
     def _analyze_average_duration(self):
         """Calculate average activity duration using At Completion Duration from P6"""
         # Use At Completion Duration (P6 work days) - REQUIRED
         duration_col = 'At Completion Duration'
 
-        if duration_col in self.df.columns:
-            # Filter out milestones - they have duration = 0 by nature
-            # Check Activity Type for milestone indicators
-            non_milestone_df = self.df.copy()
-            milestone_count = 0
-
-            if 'Activity Type' in self.df.columns:
-                # Identify milestones
-                is_milestone = self.df['Activity Type'].str.contains('Milestone', case=False, na=False)
-                milestone_count = is_milestone.sum()
-                # Exclude milestones from analysis
-                non_milestone_df = self.df[~is_milestone]
-
-            # Get durations for non-milestone activities
-            durations = non_milestone_df[duration_col].dropna()
-
-            # Filter out zero-duration activities (shouldn't happen for non-milestones, but just in case)
-            durations = durations[durations > 0]
-
-            # Calculate statistics (no need for absolute values - P6 durations are always positive)
-            if len(durations) > 0:
-                avg_duration = float(durations.mean())
-                median_duration = float(durations.median())
-                min_duration = float(durations.min())
-                max_duration = float(durations.max())
-            else:
-                avg_duration = median_duration = min_duration = max_duration = 0.0
+        if duration_col in self._available:
+            # Milestones (duration = 0 by nature) and zero/missing durations are excluded
+            milestone_count = self._is_milestone.sum()
+            stats = self._dur_stats
+
+            # No need for absolute values - P6 durations are always positive
+            avg_duration = stats['mean']
+            median_duration = stats['median']
+            min_duration = stats['min']
+            max_duration = stats['max']
 
             self.metrics['average_duration'] = {
                 'mean': round(avg_duration, 2),
@@ -451,7 +690,7 @@ class DCMAAnalyzer:
                 'max': round(max_duration, 2),
                 'target_range': [10, 20],
                 'status': 'pass' if 10 <= avg_duration <= 20 else 'warning',
-                'total_activities_analyzed': len(durations),
+                'total_activities_analyzed': stats['count'],
                 'milestones_excluded': int(milestone_count),
                 'source_column': duration_col
             }
@@ -469,37 +708,35 @@ class DCMAAnalyzer:
     def _analyze_high_float(self):
         """Analyze activities with high float"""
         high_float_activities = []
+        float_threshold = 100  # Default threshold
 
-        if 'Total Float' in self.df.columns:
+        if 'Total Float' in self._available:
             # Calculate project duration for threshold
-            if 'Start' in self.df.columns and 'Finish' in self.df.columns:
-                project_duration = int((self.df['Finish'].max() - self.df['Start'].min()).days)
-                float_threshold = float(project_duration * 0.5)  # 50% of project duration
-            else:
-                float_threshold = 100  # Default threshold
+            if 'Start' in self._available and 'Finish' in self._available:
+                float_threshold = float(self._project_duration * 0.5)  # 50% of project duration
 
-            for idx, row in self.df.iterrows():
-                total_float = row.get('Total Float', 0)
-                if pd.notna(total_float) and total_float > float_threshold:
-                    high_float_activities.append({
-                        'activity_id': row['Activity ID'],
-                        'activity_name': row['Activity Name'],
-                        'total_float': int(total_float)
-                    })
+            mask = self._tf_valid & (self._tf > float_threshold)
+            hf = self.df.loc[mask, ['Activity ID', 'Activity Name']].rename(columns={
+                'Activity ID': 'activity_id',
+                'Activity Name': 'activity_name'
+            })
+            hf['total_float'] = self._tf[mask].astype(int)
+            high_float_activities = hf.to_dict('records')
 
         self.metrics['high_float'] = {
             'count': len(high_float_activities),
-            'threshold': float_threshold if 'float_threshold' in locals() else 100,
+            'threshold': float_threshold,
             'activities': high_float_activities
         }
 
     def _analyze_float_ratio(self):
         """Calculate float ratio"""
-        if 'Total Float' in self.df.columns:
-            avg_float = float(self.df['Total Float'].mean())
+        if 'Total Float' in self._available:
+            valid_float = self._tf[self._tf_valid]
+            avg_float = float(valid_float.mean()) if valid_float.size > 0 else float('nan')
 
-            duration_col = 'At Completion Duration' if 'At Completion Duration' in self.df.columns else 'calculated_duration'
-            if duration_col in self.df.columns:
+            duration_col = 'At Completion Duration' if 'At Completion Duration' in self._available else 'calculated_duration'
+            if duration_col in self._available:
                 avg_duration = float(self.df[duration_col].mean())
                 float_ratio = float(avg_float / avg_duration) if avg_duration > 0 else 0.0
 
@@ -511,16 +748,16 @@ class DCMAAnalyzer:
                     'status': 'pass' if 0.5 <= float_ratio <= 1.5 else 'warning'
                 }
             else:
-                self.metrics['float_ratio'] = {'ratio': 0.0, 'status': 'unknown'}
+                self.metrics['float_ratio'] = copy.deepcopy(UNAVAILABLE_METRICS['float_ratio'])
         else:
-            self.metrics['float_ratio'] = {'ratio': 0.0, 'status': 'unknown'}
+            self.metrics['float_ratio'] = copy.deepcopy(UNAVAILABLE_METRICS['float_ratio'])
 
     def _analyze_comprehensive_float(self):
         """
         Comprehensive Total Float analysis with all KPIs
         Implements DCMA best practices for float analysis
         """
-        if 'Total Float' not in self.df.columns:
+        if 'Total Float' not in self._available:
             self.metrics['comprehensive_float'] = {
                 'error': 'Total Float column not found',
                 'status': 'unknown'
@@ -529,8 +766,9 @@ class DCMAAnalyzer:
             return
 
         # Get total float values, excluding NaN
-        float_series = self.df['Total Float'].dropna()
-        total_activities = len(float_series)
+        positions = np.flatnonzero(self._tf_valid)
+        tf = self._tf[positions]
+        total_activities = len(tf)
 
         if total_activities == 0:
             self.metrics['comprehensive_float'] = {
@@ -539,74 +777,47 @@ class DCMAAnalyzer:
             }
             return
 
-        # Calculate project duration for context
-        project_duration = 0
-        if 'Start' in self.df.columns and 'Finish' in self.df.columns:
-            project_duration = int((self.df['Finish'].max() - self.df['Start'].min()).days)
+        # Project duration for context (computed once in __init__)
+        project_duration = self._project_duration
+
+        # Bucket every float value in one pass; the KPI masks and histogram derive from it
+        float_bins = np.digitize(tf, FLOAT_BIN_EDGES, right=True)
+        bin_counts = np.bincount(float_bins, minlength=5)
+
+        # Only row positions are kept for the issues below - activity lists are
+        # rebuilt on demand by the dashboard, so no per-activity records here
 
         # KPI 1: Critical Path (float = 0)
-        critical_mask = float_series == 0
-        critical_count = critical_mask.sum()
+        critical_count = bin_counts[1]
         critical_pct = float((critical_count / total_activities * 100)) if total_activities > 0 else 0.0
-
-        critical_activities = []
-        if critical_count > 0:
-            critical_idx = float_series[critical_mask].index
-            for idx in critical_idx[:20]:  # Limit to top 20
-                row = self.df.loc[idx]
-                critical_activities.append({
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
-                    'total_float': 0
-                })
+        critical_idx = positions[float_bins == 1][:10]
 
         # KPI 2: Near-Critical (0 < float ≤ 10)
-        near_critical_mask = (float_series > 0) & (float_series <= 10)
-        near_critical_count = near_critical_mask.sum()
+        near_critical_count = bin_counts[2]
         near_critical_pct = float((near_critical_count / total_activities * 100)) if total_activities > 0 else 0.0
 
-        near_critical_activities = []
-        if near_critical_count > 0:
-            near_critical_idx = float_series[near_critical_mask].index
-            for idx in near_critical_idx[:20]:
-                row = self.df.loc[idx]
-                near_critical_activities.append({
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
-                    'total_float': float(row['Total Float'])
-                })
-
         # KPI 3: Negative Float (behind schedule)
-        negative_mask = float_series < 0
-        negative_count = negative_mask.sum()
+        negative_mask = float_bins == 0
+        negative_count = bin_counts[0]
         negative_pct = float((negative_count / total_activities * 100)) if total_activities > 0 else 0.0
 
-        negative_activities = []
-        if negative_count > 0:
-            # Sort by float (most negative first)
-            negative_float = float_series[negative_mask].sort_values()
-            for idx in negative_float.index[:20]:  # Top 20 worst
-                row = self.df.loc[idx]
-                negative_activities.append({
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
-                    'total_float': float(row['Total Float']),
-                    'wbs_code': str(row.get('WBS Code', 'N/A'))
-                })
+        # Sort by float (most negative first)
+        negative_order = np.argsort(tf[negative_mask], kind='quicksort')
+        negative_idx = positions[negative_mask][negative_order][:20]  # Top 20 worst
 
         # KPI 4: Float Ratio (Average Total Float / Average Remaining Duration)
-        avg_float = float(float_series.mean())
+        avg_float = float(tf.mean())
 
         # For remaining duration, use At Completion Duration for not started/in progress activities
         remaining_duration = 0
-        if 'At Completion Duration' in self.df.columns and 'Activity Status' in self.df.columns:
+        if 'At Completion Duration' in self._available and 'Activity Status' in self._available:
             not_complete = self.df['Activity Status'] != 'Completed'
             remaining_durations = self.df.loc[not_complete, 'At Completion Duration'].dropna()
             avg_remaining = float(remaining_durations.mean()) if len(remaining_durations) > 0 else 0.0
             float_ratio = float(avg_float / avg_remaining) if avg_remaining > 0 else 0.0
         else:
             # Fallback to using total duration
-            if 'At Completion Duration' in self.df.columns:
+            if 'At Completion Duration' in self._available:
                 avg_duration = float(self.df['At Completion Duration'].mean())
                 float_ratio = float(avg_float / avg_duration) if avg_duration > 0 else 0.0
                 avg_remaining = avg_duration
@@ -615,55 +826,27 @@ class DCMAAnalyzer:
                 avg_remaining = 0.0
 
         # KPI 5: Statistical measures
-        median_float = float(float_series.median())
-        std_float = float(float_series.std())
+        median_float = float(np.median(tf))
+        # Sample standard deviation (ddof=1), undefined for a single value
+        std_float = float(tf.std(ddof=1)) if tf.size > 1 else float('nan')
 
         # KPI 6: Excessive Float (>50% of project duration)
         if project_duration > 0:
             excessive_threshold = project_duration * 0.5
-            excessive_mask = float_series > excessive_threshold
+            excessive_mask = tf > excessive_threshold
             excessive_count = excessive_mask.sum()
             excessive_pct = float((excessive_count / total_activities * 100)) if total_activities > 0 else 0.0
-
-            excessive_activities = []
-            if excessive_count > 0:
-                excessive_idx = float_series[excessive_mask].index
-                for idx in excessive_idx[:20]:
-                    row = self.df.loc[idx]
-                    excessive_activities.append({
-                        'activity_id': row['Activity ID'],
-                        'activity_name': row['Activity Name'],
-                        'total_float': float(row['Total Float'])
-                    })
+            excessive_idx = positions[excessive_mask][:10]
         else:
             excessive_count = 0
             excessive_pct = 0.0
             excessive_threshold = 0.0
-            excessive_activities = []
+            excessive_idx = positions[:0]
 
         # KPI 7: Most negative float (worst delay)
-        most_negative = float(float_series.min()) if len(float_series) > 0 else 0
-
-        # Float Distribution for histogram
-        float_distribution = {
-            'negative': int(negative_count),           # < 0 (Behind)
-            'critical': int(critical_count),           # = 0 (Critical)
-            'near_critical': int(near_critical_count), # 1-10 (Near-critical)
-            'low_risk': int(((float_series > 10) & (float_series <= 30)).sum()),  # 11-30
-            'comfortable': int((float_series > 30).sum())  # > 30
-        }
-
-        # Float by WBS Code for box plot
-        float_by_wbs = {}
-        if 'WBS Code' in self.df.columns:
-            wbs_groups = self.df.groupby('WBS Code')['Total Float'].apply(list).to_dict()
-            # Limit to top 10 WBS codes by activity count
-            wbs_counts = self.df['WBS Code'].value_counts().head(10)
-            # Convert numpy types to native Python types for JSON serialization
-            float_by_wbs = {
-                str(wbs): [float(f) for f in wbs_groups.get(wbs, [])]
-                for wbs in wbs_counts.index
-            }
+        min_float = float(tf.min())
+        max_float = float(tf.max())
+        most_negative = min_float
 
         # Store comprehensive metrics - ONLY ESSENTIAL KPIs (no chart data)
         # Chart data will be calculated on-demand in the dashboard from activities
@@ -708,8 +891,8 @@ class DCMAAnalyzer:
                 'mean': round(avg_float, 2),
                 'median': round(median_float, 2),
                 'std_dev': round(std_float, 2),
-                'min': round(float(float_series.min()), 2),
-                'max': round(float(float_series.max()), 2)
+                'min': round(min_float, 2),
+                'max': round(max_float, 2)
             },
 
             # Excessive Float (KPI 6) - Numbers only
@@ -729,29 +912,30 @@ class DCMAAnalyzer:
         }
 
         # Create issues based on float analysis
+        activity_ids = self._col('Activity ID')
         # Issue 1: Negative Float (High Priority)
         if negative_count > 0:
-            self.issues.append({
-                'category': 'Schedule Performance',
-                'severity': 'high',
-                'title': f'Negative Float: {negative_count} activities behind schedule',
-                'description': f'Found {negative_count} activities ({negative_pct:.1f}%) with negative float. Most negative: {most_negative:.0f} days. These activities are behind schedule and threatening project completion.',
-                'count': int(negative_count),
-                'recommendation': 'Immediate action required: Review critical path, crash activities, add resources, or negotiate deadline extensions. Focus on activities with most negative float first.',
-                'affected_activities': [a['activity_id'] for a in negative_activities]
-            })
+            self.issues.append(Issue(
+                category='Schedule Performance',
+                severity='high',
+                title=f'Negative Float: {negative_count} activities behind schedule',
+                description=f'Found {negative_count} activities ({negative_pct:.1f}%) with negative float. Most negative: {most_negative:.0f} days. These activities are behind schedule and threatening project completion.',
+                count=int(negative_count),
+                recommendation='Immediate action required: Review critical path, crash activities, add resources, or negotiate deadline extensions. Focus on activities with most negative float first.',
+                affected_activities=activity_ids[negative_idx].tolist()
+            ))
 
         # Issue 2: Excessive Critical Path
         if critical_pct > 15:
-            self.issues.append({
-                'category': 'Schedule Risk',
-                'severity': 'medium',
-                'title': f'Excessive Critical Path: {critical_pct:.1f}% of activities',
-                'description': f'Found {critical_count} critical activities ({critical_pct:.1f}%). DCMA recommends ≤15% critical activities. High critical percentage indicates limited schedule flexibility.',
-                'count': int(critical_count),
-                'recommendation': 'Review schedule logic to add flexibility. Consider: parallel paths, reducing activity dependencies, adding float through early starts, or breaking down critical activities.',
-                'affected_activities': [a['activity_id'] for a in critical_activities[:10]]
-            })
+            self.issues.append(Issue(
+                category='Schedule Risk',
+                severity='medium',
+                title=f'Excessive Critical Path: {critical_pct:.1f}% of activities',
+                description=f'Found {critical_count} critical activities ({critical_pct:.1f}%). DCMA recommends ≤15% critical activities. High critical percentage indicates limited schedule flexibility.',
+                count=int(critical_count),
+                recommendation='Review schedule logic to add flexibility. Consider: parallel paths, reducing activity dependencies, adding float through early starts, or breaking down critical activities.',
+                affected_activities=activity_ids[critical_idx].tolist()
+            ))
 
         # Issue 3: Poor Float Ratio
         if float_ratio < 0.5 or float_ratio > 1.5:
@@ -763,54 +947,78 @@ class DCMAAnalyzer:
                 desc = f'Float Ratio is {float_ratio:.2f}, above target range (0.5-1.5). Excessive float may indicate missing logic or unrealistic schedule.'
                 rec = 'Review schedule logic. Excessive float often indicates: missing dependencies, incorrect constraints, or overly conservative durations.'
 
-            self.issues.append({
-                'category': 'Schedule Health',
-                'severity': severity,
-                'title': f'Poor Float Ratio: {float_ratio:.2f}',
-                'description': desc,
-                'count': 1,
-                'recommendation': rec,
-                'affected_activities': []
-            })
+            self.issues.append(Issue(
+                category='Schedule Health',
+                severity=severity,
+                title=f'Poor Float Ratio: {float_ratio:.2f}',
+                description=desc,
+                count=1,
+                recommendation=rec,
+                affected_activities=[]
+            ))
 
         # Issue 4: Excessive Float Activities
         if excessive_count > 0 and excessive_pct > 10:
-            self.issues.append({
-                'category': 'Logic Quality',
-                'severity': 'low',
-                'title': f'Excessive Float: {excessive_count} activities with >50% project duration float',
-                'description': f'Found {excessive_count} activities ({excessive_pct:.1f}%) with float exceeding {excessive_threshold:.0f} days (50% of project duration). May indicate missing logic links.',
-                'count': int(excessive_count),
-                'recommendation': 'Review activities with excessive float for missing predecessors/successors. Verify logic relationships are complete.',
-                'affected_activities': [a['activity_id'] for a in excessive_activities[:10]]
-            })
+            self.issues.append(Issue(
+                category='Logic Quality',
+                severity='low',
+                title=f'Excessive Float: {excessive_count} activities with >50% project duration float',
+                description=f'Found {excessive_count} activities ({excessive_pct:.1f}%) with float exceeding {excessive_threshold:.0f} days (50% of project duration). May indicate missing logic links.',
+                count=int(excessive_count),
+                recommendation='Review activities with excessive float for missing predecessors/successors. Verify logic relationships are complete.',
+                affected_activities=activity_ids[excessive_idx].tolist()
+            ))
+
+    def _float_records(self, positions, include_wbs: bool = False) -> List[Dict]:
+        """
+        Build activity records with total float for the given row positions
+
+        Args:
+            positions: Row positions into the activities table
+            include_wbs: Add the WBS code ('N/A' when the column is missing)
+
+        Returns:
+            List of activity_id/activity_name/total_float dictionaries
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        rows = zip(
+            self._col('Activity ID')[positions].tolist(),
+            self._col('Activity Name')[positions].tolist(),
+            self._tf[positions].tolist()
+        )
+        records = [
+            {'activity_id': activity_id, 'activity_name': activity_name, 'total_float': total_float}
+            for activity_id, activity_name, total_float in rows
+        ]
+        if include_wbs:
+            for record, wbs_code in zip(records, self._wbs_str[positions].tolist()):
+                record['wbs_code'] = wbs_code
+        return records
 
     def _analyze_activity_distribution(self):
         """Analyze activity distribution over time"""
-        if 'Start' in self.df.columns and 'Finish' in self.df.columns:
-            # Group by month
-            self.df['start_month'] = pd.to_datetime(self.df['Start']).dt.to_period('M')
-            distribution = self.df.groupby('start_month').size().to_dict()
-
-            # Convert Period to string for JSON serialization
-            distribution_str = {str(k): v for k, v in distribution.items()}
+        if 'Start' in self._available and 'Finish' in self._available:
+            # Bucket by calendar month directly on the timestamps (no Period column)
+            start = pd.to_datetime(self.df['Start']).dropna()
+            distribution_str = {}
+            if not start.empty:
+                counts = start.to_frame('Start').groupby(pd.Grouper(key='Start', freq='MS')).size()
+                # Month bins cover the whole range - keep only months that have activities
+                distribution_str = {k.strftime('%Y-%m'): int(v) for k, v in counts.items() if v}
 
             self.metrics['activity_distribution'] = {
                 'by_month': distribution_str,
-                'total_months': len(distribution)
+                'total_months': len(distribution_str)
             }
         else:
-            self.metrics['activity_distribution'] = {'by_month': {}, 'total_months': 0}
+            self.metrics['activity_distribution'] = copy.deepcopy(UNAVAILABLE_METRICS['activity_distribution'])
 
     def _analyze_resource_assignment(self):
         """Analyze resource assignments"""
         unassigned = []
 
-        if 'Resource Names' in self.df.columns:
-            for idx, row in self.df.iterrows():
-                resources = row.get('Resource Names', '')
-                if pd.isna(resources) or str(resources).strip() == '' or str(resources).lower() == 'nan':
-                    unassigned.append(row['Activity ID'])
+        if 'Resource Names' in self._available:
+            unassigned = self.df.loc[self._unassigned_resources(), 'Activity ID'].tolist()
 
         self.metrics['resource_assignment'] = {
             'unassigned_count': len(unassigned),
@@ -818,21 +1026,40 @@ class DCMAAnalyzer:
             'unassigned_activities': unassigned
         }
 
+    def _unassigned_resources(self) -> np.ndarray:
+        """Boolean mask of activities with blank, NaN or 'nan' Resource Names"""
+        resources = self.df['Resource Names']
+        if isinstance(resources.dtype, pd.CategoricalDtype):
+            # Test each distinct resource string once, then broadcast through the codes
+            text = pd.Series(resources.cat.categories).astype(str)
+            blank = ((text.str.strip() == '') | (text.str.lower() == 'nan')).to_numpy(dtype=bool)
+            codes = resources.cat.codes.to_numpy()
+            # Code -1 marks NaN
+            return np.append(blank, True)[codes]
+
+        text = resources.astype(str)
+        mask = resources.isna() | (text.str.strip() == '') | (text.str.lower() == 'nan')
+        return mask.to_numpy(dtype=bool)
+
     def _analyze_milestones(self):
         """Analyze milestones"""
         milestones = []
 
-        duration_col = 'At Completion Duration' if 'At Completion Duration' in self.df.columns else 'calculated_duration'
+        duration_col = 'At Completion Duration' if 'At Completion Duration' in self._available else 'calculated_duration'
 
-        if duration_col in self.df.columns:
-            for idx, row in self.df.iterrows():
-                duration = row.get(duration_col, 1)
-                if duration == 0 or pd.isna(duration):
-                    milestones.append({
-                        'activity_id': row['Activity ID'],
-                        'activity_name': row['Activity Name'],
-                        'type': row.get('Activity Type', 'Unknown')
-                    })
+        if duration_col in self._available:
+            duration = self.df[duration_col]
+            positions = np.flatnonzero((duration.isna() | (duration == 0)).to_numpy(dtype=bool))
+
+            rows = zip(
+                self._col('Activity ID')[positions].tolist(),
+                self._col('Activity Name')[positions].tolist(),
+                self._col('Activity Type', 'Unknown')[positions].tolist()
+            )
+            milestones = [
+                {'activity_id': activity_id, 'activity_name': activity_name, 'type': activity_type}
+                for activity_id, activity_name, activity_type in rows
+            ]
 
         self.metrics['milestones'] = {
             'count': len(milestones),
@@ -841,8 +1068,8 @@ class DCMAAnalyzer:
 
     def _analyze_activity_types(self):
         """Analyze activity types distribution"""
-        if 'Activity Type' in self.df.columns:
-            type_distribution = self.df['Activity Type'].value_counts().to_dict()
+        if 'Activity Type' in self._available:
+            type_distribution = self._value_distribution('Activity Type')
         else:
             type_distribution = {}
 
@@ -850,23 +1077,36 @@ class DCMAAnalyzer:
             'distribution': type_distribution
         }
 
+    def _value_distribution(self, column: str) -> Dict:
+        """Count of activities per value of a column, most frequent first"""
+        values = self.df[column]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            return values.value_counts().to_dict()
+
+        # Count the category codes directly (code -1 marks NaN); only the
+        # handful of distinct values is sorted, not the rows
+        codes = values.cat.codes.to_numpy()
+        present = codes[codes >= 0]
+        counts = np.bincount(present, minlength=len(values.cat.categories))
+        # List values in first-seen order before sorting, as value_counts does, so tied
+        # counts keep the same order whatever the category order is
+        seen = pd.unique(present)
+        return pd.Series(counts[seen], index=values.cat.categories[seen]).sort_values(ascending=False).to_dict()
+
     def _analyze_relationship_types(self):
         """Analyze relationship type distribution"""
-        relationship_types = {'FS': 0, 'SS': 0, 'FF': 0, 'SF': 0}
-        total_relationships = 0
+        type_order = ['FS', 'SS', 'FF', 'SF']
+        total_relationships = len(self._rels)
 
-        for idx, row in self.df.iterrows():
-            predecessors = row.get('predecessor_list', [])
-            for pred in predecessors:
-                rel_type = pred.get('type', 'FS')
-                if rel_type in relationship_types:
-                    relationship_types[rel_type] += 1
-                total_relationships += 1
+        counts = self._rels['type'].value_counts().reindex(type_order, fill_value=0).to_numpy()
+        relationship_types = dict(zip(type_order, counts.tolist()))
 
         # Calculate percentages
-        percentages = {}
-        for rel_type, count in relationship_types.items():
-            percentages[rel_type] = round((count / total_relationships * 100), 2) if total_relationships > 0 else 0
+        if total_relationships > 0:
+            shares = (counts / total_relationships * 100).tolist()
+            percentages = {rel_type: round(share, 2) for rel_type, share in zip(type_order, shares)}
+        else:
+            percentages = dict.fromkeys(type_order, 0)
 
         self.metrics['relationship_types'] = {
             'counts': relationship_types,
@@ -877,19 +1117,19 @@ class DCMAAnalyzer:
         # Check for excessive non-FS relationships
         non_fs_percentage = 100 - percentages['FS']
         if non_fs_percentage > 20:
-            self.issues.append({
-                'category': 'Logic Quality',
-                'severity': 'low',
-                'title': f'High Non-FS Relationships: {non_fs_percentage:.1f}%',
-                'description': f'Found {non_fs_percentage:.1f}% non-Finish-to-Start relationships. While valid, this may indicate overly complex logic.',
-                'count': total_relationships - relationship_types['FS'],
-                'recommendation': 'Review SS, FF, and SF relationships to ensure they are necessary and correctly represent the work flow.'
-            })
+            self.issues.append(Issue(
+                category='Logic Quality',
+                severity='low',
+                title=f'High Non-FS Relationships: {non_fs_percentage:.1f}%',
+                description=f'Found {non_fs_percentage:.1f}% non-Finish-to-Start relationships. While valid, this may indicate overly complex logic.',
+                count=total_relationships - relationship_types['FS'],
+                recommendation='Review SS, FF, and SF relationships to ensure they are necessary and correctly represent the work flow.'
+            ))
 
     def _analyze_activity_status(self):
         """Analyze activity status distribution"""
-        if 'Activity Status' in self.df.columns:
-            status_distribution = self.df['Activity Status'].value_counts().to_dict()
+        if 'Activity Status' in self._available:
+            status_distribution = self._value_distribution('Activity Status')
         else:
             status_distribution = {}
 
@@ -903,7 +1143,7 @@ class DCMAAnalyzer:
         DCMA #5: Negative Float
         Target: 0% (no activities behind schedule)
         """
-        if 'Total Float' not in self.df.columns:
+        if 'Total Float' not in self._available:
             self.metrics['dcma_negative_float'] = {
                 'count': 0,
                 'percentage': 0,
@@ -915,20 +1155,10 @@ class DCMAAnalyzer:
             }
             return
 
-        negative_float_activities = []
-        float_series = self.df['Total Float'].dropna()
+        negative_positions = np.flatnonzero(self._tf_valid & (self._tf < 0))
+        negative_float_activities = self._float_records(negative_positions, include_wbs=True)
 
-        for idx, row in self.df.iterrows():
-            total_float = row.get('Total Float')
-            if pd.notna(total_float) and total_float < 0:
-                negative_float_activities.append({
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
-                    'total_float': float(total_float),
-                    'wbs_code': str(row.get('WBS Code', 'N/A'))
-                })
-
-        total_activities = len(float_series)
+        total_activities = int(self._tf_valid.sum())
         percentage = (len(negative_float_activities) / total_activities * 100) if total_activities > 0 else 0
 
         self.metrics['dcma_negative_float'] = {
@@ -1001,41 +1231,20 @@ class DCMAAnalyzer:
         Target: <5% of activities with duration >44 working days
         Exclude: Milestones (0 duration), completed activities
         """
-        long_activities = []
         duration_col = 'At Completion Duration'
 
-        if duration_col not in self.df.columns:
-            self.metrics['dcma_long_durations'] = {
-                'count': 0,
-                'percentage': 0,
-                'total_analyzed': 0,
-                'activities': [],
-                'threshold': 44,
-                'target': 5.0,
-                'status': 'unknown',
-                'error': 'At Completion Duration column not available'
-            }
+        if duration_col not in self._available:
+            self.metrics['dcma_long_durations'] = copy.deepcopy(UNAVAILABLE_METRICS['dcma_long_durations'])
             return
 
         # Filter: incomplete activities, non-milestones
-        incomplete_df = self.df.copy()
-        if 'Activity Status' in self.df.columns:
-            incomplete_df = incomplete_df[incomplete_df['Activity Status'] != 'Completed']
+        analyzed = self._incomplete & ~self._is_milestone
+        total_analyzed = int(analyzed.sum())
 
-        # Exclude milestones
-        if 'Activity Type' in incomplete_df.columns:
-            incomplete_df = incomplete_df[~incomplete_df['Activity Type'].str.contains('Milestone', case=False, na=False)]
-
-        total_analyzed = len(incomplete_df)
-
-        for idx, row in incomplete_df.iterrows():
-            duration = row.get(duration_col, 0)
-            if pd.notna(duration) and duration > 44:
-                long_activities.append({
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
-                    'duration': int(duration)
-                })
+        # NaN durations compare False, so no separate notna check is needed
+        long_positions = np.flatnonzero(analyzed & (self._dur_arr > 44))
+        long_activities = self._duration_records(long_positions)
+        long_ids = self._col('Activity ID')[long_positions].tolist()
 
         percentage = (len(long_activities) / total_analyzed * 100) if total_analyzed > 0 else 0
 
@@ -1051,15 +1260,15 @@ class DCMAAnalyzer:
         }
 
         if percentage >= 5.0:
-            self.issues.append({
-                'category': 'Schedule Granularity',
-                'severity': 'medium',
-                'title': f'DCMA: Long Duration Activities: {percentage:.1f}%',
-                'description': f'Found {len(long_activities)} incomplete activities exceeding 44 working days ({percentage:.1f}% of incomplete activities). DCMA target is <5%.',
-                'count': len(long_activities),
-                'recommendation': 'Decompose activities >44 days into smaller tasks with clearer deliverables and progress tracking.',
-                'affected_activities': [a['activity_id'] for a in long_activities]
-            })
+            self.issues.append(Issue(
+                category='Schedule Granularity',
+                severity='medium',
+                title=f'DCMA: Long Duration Activities: {percentage:.1f}%',
+                description=f'Found {len(long_activities)} incomplete activities exceeding 44 working days ({percentage:.1f}% of incomplete activities). DCMA target is <5%.',
+                count=len(long_activities),
+                recommendation='Decompose activities >44 days into smaller tasks with clearer deliverables and progress tracking.',
+                affected_activities=long_ids
+            ))
 
     def _analyze_invalid_dates(self):
         """
@@ -1068,14 +1277,8 @@ class DCMAAnalyzer:
         """
         invalid_date_activities = []
 
-        if 'Start' not in self.df.columns or 'Finish' not in self.df.columns:
-            self.metrics['dcma_invalid_dates'] = {
-                'count': 0,
-                'activities': [],
-                'target': 0,
-                'status': 'unknown',
-                'error': 'Start/Finish date columns not available'
-            }
+        if 'Start' not in self._available or 'Finish' not in self._available:
+            self.metrics['dcma_invalid_dates'] = copy.deepcopy(UNAVAILABLE_METRICS['dcma_invalid_dates'])
             return
 
         # Determine data date (use earliest start as proxy if not available)
@@ -1120,15 +1323,15 @@ class DCMAAnalyzer:
         }
 
         if len(invalid_date_activities) > 0:
-            self.issues.append({
-                'category': 'Schedule Realism',
-                'severity': 'medium',
-                'title': f'DCMA: Invalid Dates: {len(invalid_date_activities)} activities',
-                'description': f'Found {len(invalid_date_activities)} activities with invalid dates (before data date or >5 years in future).',
-                'count': len(invalid_date_activities),
-                'recommendation': 'Review and correct activity dates. Ensure incomplete activities do not have start dates before the data date.',
-                'affected_activities': [a['activity_id'] for a in invalid_date_activities]
-            })
+            self.issues.append(Issue(
+                category='Schedule Realism',
+                severity='medium',
+                title=f'DCMA: Invalid Dates: {len(invalid_date_activities)} activities',
+                description=f'Found {len(invalid_date_activities)} activities with invalid dates (before data date or >5 years in future).',
+                count=len(invalid_date_activities),
+                recommendation='Review and correct activity dates. Ensure incomplete activities do not have start dates before the data date.',
+                affected_activities=[a['activity_id'] for a in invalid_date_activities]
+            ))
 
     def _analyze_high_float_dcma(self):
         """
@@ -1136,45 +1339,24 @@ class DCMAAnalyzer:
         Target: <5% of activities with float >44 days
         Exclude: Milestones (0 duration), completed activities
         """
-        if 'Total Float' not in self.df.columns:
-            self.metrics['dcma_high_float'] = {
-                'count': 0,
-                'percentage': 0,
-                'total_analyzed': 0,
-                'activities': [],
-                'threshold': 44,
-                'target': 5.0,
-                'status': 'unknown',
-                'error': 'Total Float column not available'
-            }
+        if 'Total Float' not in self._available:
+            self.metrics['dcma_high_float'] = copy.deepcopy(UNAVAILABLE_METRICS['dcma_high_float'])
             return
 
-        # Filter: incomplete activities, non-milestones
-        incomplete_df = self.df.copy()
-        if 'Activity Status' in self.df.columns:
-            incomplete_df = incomplete_df[incomplete_df['Activity Status'] != 'Completed']
-
-        # Exclude milestones
-        if 'Activity Type' in incomplete_df.columns:
-            incomplete_df = incomplete_df[~incomplete_df['Activity Type'].str.contains('Milestone', case=False, na=False)]
+        # Filter: incomplete activities, non-milestones (mask selection, no copy)
+        keep = self._incomplete & ~self._is_milestone
 
         # Also exclude by duration if Activity Type not available
-        if 'At Completion Duration' in incomplete_df.columns:
-            incomplete_df = incomplete_df[incomplete_df['At Completion Duration'] != 0]
-
-        high_float_activities = []
+        if 'At Completion Duration' in self._available:
+            keep &= (self.df['At Completion Duration'] != 0).to_numpy(dtype=bool)
 
-        for idx, row in incomplete_df.iterrows():
-            total_float = row.get('Total Float')
-            if pd.notna(total_float) and total_float > 44:
-                high_float_activities.append({
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
-                    'total_float': float(total_float),
-                    'status': row.get('Activity Status', 'Unknown')
-                })
+        high_positions = np.flatnonzero(keep & self._tf_valid & (self._tf > 44))
+        high_float_activities = self._float_records(high_positions)
+        statuses = self._col('Activity Status', 'Unknown')[high_positions].tolist()
+        for activity, status in zip(high_float_activities, statuses):
+            activity['status'] = status
 
-        total_analyzed = len(incomplete_df)
+        total_analyzed = int(keep.sum())
         percentage = (len(high_float_activities) / total_analyzed * 100) if total_analyzed > 0 else 0
 
         self.metrics['dcma_high_float'] = {
@@ -1189,49 +1371,38 @@ class DCMAAnalyzer:
         }
 
         if percentage >= 5.0:
-            self.issues.append({
-                'category': 'Logic Quality',
-                'severity': 'medium',
-                'title': f'DCMA: High Float (>44 days): {percentage:.1f}%',
-                'description': f'Found {len(high_float_activities)} incomplete activities with float >44 days ({percentage:.1f}% of {total_analyzed} incomplete, non-milestone activities). DCMA target is <5%. High float may indicate missing logic.',
-                'count': len(high_float_activities),
-                'recommendation': 'Review activities with excessive float for missing predecessors/successors. Add logic relationships to reduce float.',
-                'affected_activities': [a['activity_id'] for a in high_float_activities[:20]]
-            })
+            self.issues.append(Issue(
+                category='Logic Quality',
+                severity='medium',
+                title=f'DCMA: High Float (>44 days): {percentage:.1f}%',
+                description=f'Found {len(high_float_activities)} incomplete activities with float >44 days ({percentage:.1f}% of {total_analyzed} incomplete, non-milestone activities). DCMA target is <5%. High float may indicate missing logic.',
+                count=len(high_float_activities),
+                recommendation='Review activities with excessive float for missing predecessors/successors. Add logic relationships to reduce float.',
+                affected_activities=self._col('Activity ID')[high_positions[:20]].tolist()
+            ))
 
     def _analyze_missing_resources_dcma(self):
         """
         DCMA #10: Missing Resources
         Target: ≤5% of incomplete activities without resource assignments
         """
-        if 'Resource Names' not in self.df.columns:
-            self.metrics['dcma_missing_resources'] = {
-                'count': 0,
-                'percentage': 0,
-                'total_incomplete': 0,
-                'activities': [],
-                'target': 5.0,
-                'status': 'n/a',
-                'result_text': 'N/A - Resource data not in export'
-            }
+        if 'Resource Names' not in self._available:
+            self.metrics['dcma_missing_resources'] = copy.deepcopy(UNAVAILABLE_METRICS['dcma_missing_resources'])
             return
 
         # Filter to incomplete activities only
-        incomplete_df = self.df.copy()
-        if 'Activity Status' in self.df.columns:
-            incomplete_df = incomplete_df[incomplete_df['Activity Status'] != 'Completed']
-
-        total_incomplete = len(incomplete_df)
-        unassigned_activities = []
-
-        for idx, row in incomplete_df.iterrows():
-            resources = row.get('Resource Names', '')
-            if pd.isna(resources) or str(resources).strip() == '' or str(resources).lower() == 'nan':
-                unassigned_activities.append({
-                    'activity_id': row['Activity ID'],
-                    'activity_name': row['Activity Name'],
-                    'status': row.get('Activity Status', 'Unknown')
-                })
+        total_incomplete = int(self._incomplete.sum())
+        positions = np.flatnonzero(self._incomplete & self._unassigned_resources())
+
+        rows = zip(
+            self._col('Activity ID')[positions].tolist(),
+            self._col('Activity Name')[positions].tolist(),
+            self._col('Activity Status', 'Unknown')[positions].tolist()
+        )
+        unassigned_activities = [
+            {'activity_id': activity_id, 'activity_name': activity_name, 'status': status}
+            for activity_id, activity_name, status in rows
+        ]
 
         percentage = (len(unassigned_activities) / total_incomplete * 100) if total_incomplete > 0 else 0
 
@@ -1246,37 +1417,25 @@ class DCMAAnalyzer:
         }
 
         if percentage > 5.0:
-            self.issues.append({
-                'category': 'Execution Readiness',
-                'severity': 'medium',
-                'title': f'DCMA: Missing Resources: {percentage:.1f}%',
-                'description': f'Found {len(unassigned_activities)} incomplete activities without resource assignments ({percentage:.1f}% of incomplete activities). DCMA target is ≤5%.',
-                'count': len(unassigned_activities),
-                'recommendation': 'Assign resources to all incomplete activities. Resource loading is essential for realistic schedule and capacity planning.',
-                'affected_activities': [a['activity_id'] for a in unassigned_activities[:20]]
-            })
+            self.issues.append(Issue(
+                category='Execution Readiness',
+                severity='medium',
+                title=f'DCMA: Missing Resources: {percentage:.1f}%',
+                description=f'Found {len(unassigned_activities)} incomplete activities without resource assignments ({percentage:.1f}% of incomplete activities). DCMA target is ≤5%.',
+                count=len(unassigned_activities),
+                recommendation='Assign resources to all incomplete activities. Resource loading is essential for realistic schedule and capacity planning.',
+                affected_activities=self._col('Activity ID')[positions[:20]].tolist()
+            ))
 
     def _analyze_ss_ff_relationships(self):
         """
         DCMA #11: SS/FF Relationships (Leads)
         Target: ≤10% of relationships are Start-to-Start or Finish-to-Finish
         """
-        ss_ff_relationships = []
-        total_relationships = 0
-
-        for idx, row in self.df.iterrows():
-            predecessors = row.get('predecessor_list', [])
-            for pred in predecessors:
-                total_relationships += 1
-                rel_type = pred.get('type', 'FS')
-                if rel_type in ['SS', 'FF']:
-                    ss_ff_relationships.append({
-                        'activity_id': row['Activity ID'],
-                        'activity_name': row['Activity Name'],
-                        'predecessor': pred['activity'],
-                        'type': rel_type,
-                        'lag': pred.get('lag', 0)
-                    })
+        rels = self._rels
+        total_relationships = len(rels)
+        ss_ff = rels.loc[rels['type'].isin(['SS', 'FF'])]
+        ss_ff_relationships = ss_ff.to_dict('records')
 
         percentage = (len(ss_ff_relationships) / total_relationships * 100) if total_relationships > 0 else 0
 
@@ -1291,15 +1450,15 @@ class DCMAAnalyzer:
         }
 
         if percentage > 10.0:
-            self.issues.append({
-                'category': 'Logic Quality',
-                'severity': 'low',
-                'title': f'DCMA: Excessive SS/FF Relationships: {percentage:.1f}%',
-                'description': f'Found {len(ss_ff_relationships)} SS/FF relationships ({percentage:.1f}% of total). DCMA target is ≤10%. Excessive SS/FF may indicate complex or non-standard logic.',
-                'count': len(ss_ff_relationships),
-                'recommendation': 'Review SS and FF relationships. While valid, excessive use may complicate schedule understanding. Consider if FS relationships with leads would be clearer.',
-                'affected_activities': [r['activity_id'] for r in ss_ff_relationships[:20]]
-            })
+            self.issues.append(Issue(
+                category='Logic Quality',
+                severity='low',
+                title=f'DCMA: Excessive SS/FF Relationships: {percentage:.1f}%',
+                description=f'Found {len(ss_ff_relationships)} SS/FF relationships ({percentage:.1f}% of total). DCMA target is ≤10%. Excessive SS/FF may indicate complex or non-standard logic.',
+                count=len(ss_ff_relationships),
+                recommendation='Review SS and FF relationships. While valid, excessive use may complicate schedule understanding. Consider if FS relationships with leads would be clearer.',
+                affected_activities=ss_ff['activity_id'].head(20).tolist()
+            ))
 
     def get_dcma_14_point_summary(self, cpli: float, bei: float) -> Dict:
         """
@@ -1507,7 +1666,7 @@ class DCMAAnalyzer:
         Analyze WBS (Work Breakdown Structure) distribution and metrics
         """
         # Check if WBS data is available
-        if 'wbs_level_0' not in self.df.columns or self.df['wbs_level_0'].isna().all():
+        if 'wbs_level_0' not in self._available or self.df['wbs_level_0'].isna().all():
             self.metrics['wbs_analysis'] = {
                 'available': False,
                 'message': 'WBS data not available'
@@ -1522,14 +1681,14 @@ class DCMAAnalyzer:
         }
 
         # WBS Depth Analysis
-        if 'wbs_depth' in self.df.columns:
+        if 'wbs_depth' in self._available:
             depth_distribution = self.df['wbs_depth'].value_counts().sort_index().to_dict()
             wbs_metrics['depth_distribution'] = {int(k): int(v) for k, v in depth_distribution.items()}
             wbs_metrics['avg_depth'] = float(self.df['wbs_depth'].mean())
             wbs_metrics['max_depth'] = int(self.df['wbs_depth'].max())
 
         # WBS Level 1 (Phase) Analysis
-        if 'wbs_level_1' in self.df.columns:
+        if 'wbs_level_1' in self._available:
             level1_stats = self._calculate_wbs_level_stats(1)
             # Add health scores to level 1
             for wbs_code, stats in level1_stats.items():
@@ -1537,7 +1696,7 @@ class DCMAAnalyzer:
             wbs_metrics['level_1_phases'] = level1_stats
 
         # WBS Level 2 (Area) Analysis
-        if 'wbs_level_2' in self.df.columns:
+        if 'wbs_level_2' in self._available:
             level2_stats = self._calculate_wbs_level_stats(2)
             # Add health scores to level 2
             for wbs_code, stats in level2_stats.items():
@@ -1559,7 +1718,7 @@ class DCMAAnalyzer:
         """
         level_col = f'wbs_level_{level}'
         
-        if level_col not in self.df.columns:
+        if level_col not in self._available:
             return {}
 
         # Filter out NaN values
@@ -1568,34 +1727,35 @@ class DCMAAnalyzer:
         if len(valid_df) == 0:
             return {}
 
-        # Group by WBS level
+        # Group by WBS level (first-appearance order, one pass over the rows)
         stats = {}
         
-        for wbs_code in valid_df[level_col].unique():
-            wbs_df = valid_df[valid_df[level_col] == wbs_code]
-            
+        for wbs_code, wbs_df in valid_df.groupby(level_col, sort=False):
             wbs_stats = {
                 'activity_count': int(len(wbs_df)),
                 'percentage': round(float(len(wbs_df) / len(self.df) * 100), 1)
             }
 
-            # Add float statistics if available
+            # Add float statistics if available (all reductions on one float array)
             if 'Total Float' in wbs_df.columns:
-                float_series = wbs_df['Total Float'].dropna()
-                if len(float_series) > 0:
-                    wbs_stats['avg_float'] = round(float(float_series.mean()), 1)
-                    wbs_stats['critical_count'] = int((float_series == 0).sum())
-                    wbs_stats['negative_float_count'] = int((float_series < 0).sum())
+                floats = wbs_df['Total Float'].to_numpy(dtype=np.float64)
+                floats = floats[~np.isnan(floats)]
+                if floats.size > 0:
+                    wbs_stats['avg_float'] = round(float(floats.mean()), 1)
+                    wbs_stats['critical_count'] = int(np.count_nonzero(floats == 0))
+                    wbs_stats['negative_float_count'] = int(np.count_nonzero(floats < 0))
 
             # Add duration statistics if available
             if 'At Completion Duration' in wbs_df.columns:
-                duration_series = wbs_df['At Completion Duration'].dropna()
-                if len(duration_series) > 0:
-                    wbs_stats['avg_duration'] = round(float(duration_series.mean()), 1)
+                durations = wbs_df['At Completion Duration'].to_numpy(dtype=np.float64)
+                durations = durations[~np.isnan(durations)]
+                if durations.size > 0:
+                    wbs_stats['avg_duration'] = round(float(durations.mean()), 1)
 
             # Add status distribution if available
             if 'Activity Status' in wbs_df.columns:
-                status_dist = wbs_df['Activity Status'].value_counts().to_dict()
+                # Count the area's own values so ties follow first-seen order within the area
+                status_dist = wbs_df['Activity Status'].astype(object).value_counts().to_dict()
                 wbs_stats['status_distribution'] = status_dist
 
             stats[str(wbs_code)] = wbs_stats
@@ -5,23 +5,92 @@ Calculates CPLI, BEI, and overall schedule health score
 
 import pandas as pd
 import numpy as np
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+
+# Shared read-only stand-in for a metric missing from the DCMA results
+_EMPTY = MappingProxyType({})
+
+# Display templates for the health score deductions returned by _health_score_kernel
+DEDUCTION_LABELS = {
+    'negative_lags': 'Negative lags: -{:g}',
+    'positive_lags': 'Excessive positive lags: -{:.1f}',
+    'hard_constraints': 'Excessive hard constraints: -{:.1f}',
+    'missing_logic': 'Missing logic: -{:g}',
+    'very_long_durations': 'Very long durations: -{:g}',
+    'low_cpli': 'Low CPLI: -{:g}',
+    'good_cpli': 'Good CPLI: +{:g}'  # amount is stored negated
+}
+
+# Capped health score deductions, in application order:
+#   negative lags        -10 points per negative lag (max -30)
+#   positive lags        -1 point per % over 5% (max -10)
+#   hard constraints     -2 points per % over 10% (max -20)
+#   missing logic        -5 points per activity with missing logic (max -25)
+#   very long durations  -1 point per activity over 5 months (max -10)
+DEDUCTION_CODES = ('negative_lags', 'positive_lags', 'hard_constraints', 'missing_logic', 'very_long_durations')
+DEDUCTION_ALLOWANCES = np.array([0.0, 5.0, 10.0, 0.0, 0.0])
+DEDUCTION_RATES = np.array([10.0, 1.0, 2.0, 5.0, 1.0])
+DEDUCTION_CAPS = np.array([30.0, 10.0, 20.0, 25.0, 10.0])
+
+
+def _health_score_kernel(neg_lags, pos_lag_pct, constraint_pct, missing_logic,
+                         very_long, cpli_value) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Numeric core of the schedule health score
+
+    Returns:
+        Tuple of (score clamped to 0-100, list of (deduction code, amount)) in application order
+    """
+    inputs = np.array([neg_lags, pos_lag_pct, constraint_pct, missing_logic, very_long], dtype=np.float64)
+    raw = (inputs - DEDUCTION_ALLOWANCES) * DEDUCTION_RATES
+    active = raw > 0
+    amounts = np.minimum(raw, DEDUCTION_CAPS)
+
+    deductions = [
+        (code, amount)
+        for code, amount, applies in zip(DEDUCTION_CODES, amounts.tolist(), active.tolist())
+        if applies
+    ]
+
+    # CPLI bonus/penalty (a bonus is recorded as a negative deduction)
+    if cpli_value > 0:
+        if cpli_value < 0.90:
+            deductions.append(('low_cpli', 15))
+        elif cpli_value >= 0.95:
+            deductions.append(('good_cpli', -5))
+
+    # Subtract in application order so the displayed one-decimal score stays stable
+    score = 100.0
+    for _, amount in deductions:
+        score -= amount
+
+    return float(np.clip(score, 0.0, 100.0)), deductions
 
 
 class MetricsCalculator:
     """Calculates advanced schedule performance metrics"""
 
-    def __init__(self, schedule_data: Dict, dcma_metrics: Dict):
+    def __init__(self, schedule_data: Dict, dcma_metrics: Dict, df: Optional[pd.DataFrame] = None):
         """
         Initialize calculator
 
         Args:
             schedule_data: Parsed schedule data
             dcma_metrics: DCMA analysis metrics
+            df: Activities DataFrame already built for this schedule (e.g. ScheduleParser.df).
+                Built from schedule_data['activities'] when not provided.
         """
         self.schedule_data = schedule_data
         self.dcma_metrics = dcma_metrics
-        self.df = pd.DataFrame(schedule_data['activities'])
+        # A header-only export's frame still carries every column; build from the empty
+        # activities list instead so the column-gated statistics are skipped as before
+        self.df = df if df is not None and len(df) else pd.DataFrame(schedule_data['activities'])
+        self._cpli_cache = None
+
+        # Column presence is checked once here rather than inside every calculation
+        self._available = frozenset(self.df.columns)
 
     def calculate_all_metrics(self) -> Dict:
         """Calculate all performance metrics"""
@@ -46,12 +115,20 @@ class MetricsCalculator:
         Calculate Critical Path Length Index
         CPLI = (Critical Path Duration + Total Float) / Critical Path Duration
         Target: ≥ 0.95
+
+        The result is cached - the health score reuses it.
         """
+        if self._cpli_cache is None:
+            self._cpli_cache = self._compute_cpli()
+        return self._cpli_cache
+
+    def _compute_cpli(self) -> Dict:
+        """Compute the CPLI result (uncached)"""
         # Simplified CPLI calculation
         # In a full implementation, this would identify the actual critical path
         # For now, we'll use minimum float activities as critical path approximation
 
-        if 'Total Float' not in self.df.columns:
+        if 'Total Float' not in self._available:
             return {
                 'value': 0,
                 'status': 'unknown',
@@ -71,9 +148,9 @@ class MetricsCalculator:
             }
 
         # Calculate critical path duration (sum of critical activities)
-        duration_col = 'At Completion Duration' if 'At Completion Duration' in self.df.columns else 'calculated_duration'
+        duration_col = 'At Completion Duration' if 'At Completion Duration' in self._available else 'calculated_duration'
 
-        if duration_col not in self.df.columns:
+        if duration_col not in self._available:
             return {
                 'value': 0,
                 'status': 'unknown',
@@ -82,7 +159,7 @@ class MetricsCalculator:
             }
 
         # Estimate critical path length
-        if 'Start' in self.df.columns and 'Finish' in self.df.columns:
+        if 'Start' in self._available and 'Finish' in self._available:
             critical_path_duration = (self.df['Finish'].max() - self.df['Start'].min()).days
         else:
             critical_path_duration = critical_activities[duration_col].sum()
@@ -119,7 +196,7 @@ class MetricsCalculator:
         BEI = Completed Tasks / Planned Completed Tasks
         Target: ≥ 0.95
         """
-        if 'Activity Status' not in self.df.columns:
+        if 'Activity Status' not in self._available:
             return {
                 'value': 0,
                 'status': 'unknown',
@@ -174,58 +251,16 @@ class MetricsCalculator:
         Calculate overall schedule health score (0-100)
         Based on DCMA compliance metrics
         """
-        score = 100.0
-        deductions = []
-
-        # Negative lags: -10 points per negative lag (max -30)
-        neg_lags = self.dcma_metrics.get('negative_lags', {}).get('count', 0)
-        if neg_lags > 0:
-            deduction = min(neg_lags * 10, 30)
-            score -= deduction
-            deductions.append(f"Negative lags: -{deduction}")
-
-        # Positive lags: -1 point per % over 5% (max -10)
-        pos_lag_pct = self.dcma_metrics.get('positive_lags', {}).get('percentage', 0)
-        if pos_lag_pct > 5:
-            deduction = min((pos_lag_pct - 5) * 1, 10)
-            score -= deduction
-            deductions.append(f"Excessive positive lags: -{deduction:.1f}")
-
-        # Hard constraints: -2 points per % over 10% (max -20)
-        constraint_pct = self.dcma_metrics.get('hard_constraints', {}).get('percentage', 0)
-        if constraint_pct > 10:
-            deduction = min((constraint_pct - 10) * 2, 20)
-            score -= deduction
-            deductions.append(f"Excessive hard constraints: -{deduction:.1f}")
-
-        # Missing logic: -5 points per activity with missing logic (max -25)
-        missing_logic = self.dcma_metrics.get('missing_logic', {}).get('count', 0)
-        if missing_logic > 0:
-            deduction = min(missing_logic * 5, 25)
-            score -= deduction
-            deductions.append(f"Missing logic: -{deduction}")
-
-        # Long duration activities: -1 point per activity over 5 months (max -10)
-        very_long = len(self.dcma_metrics.get('long_durations', {}).get('activities_5_months', []))
-        if very_long > 0:
-            deduction = min(very_long * 1, 10)
-            score -= deduction
-            deductions.append(f"Very long durations: -{deduction}")
-
-        # CPLI bonus/penalty
-        cpli_value = self._calculate_cpli().get('value', 0)
-        if cpli_value > 0:
-            if cpli_value < 0.90:
-                deduction = 15
-                score -= deduction
-                deductions.append(f"Low CPLI: -{deduction}")
-            elif cpli_value >= 0.95:
-                bonus = 5
-                score += bonus
-                deductions.append(f"Good CPLI: +{bonus}")
-
-        # Ensure score is between 0 and 100
-        score = max(0, min(100, score))
+        dm = self.dcma_metrics
+        score, applied = _health_score_kernel(
+            neg_lags=(dm.get('negative_lags') or _EMPTY).get('count', 0),
+            pos_lag_pct=(dm.get('positive_lags') or _EMPTY).get('percentage', 0),
+            constraint_pct=(dm.get('hard_constraints') or _EMPTY).get('percentage', 0),
+            missing_logic=(dm.get('missing_logic') or _EMPTY).get('count', 0),
+            very_long=len((dm.get('long_durations') or _EMPTY).get('activities_5_months', ())),
+            cpli_value=self._calculate_cpli().get('value', 0)
+        )
+        deductions = [DEDUCTION_LABELS[code].format(abs(amount)) for code, amount in applied]
 
         # Determine health rating
         if score >= 90:
@@ -254,29 +289,33 @@ class MetricsCalculator:
 
     def _calculate_statistics(self) -> Dict:
         """Calculate general schedule statistics"""
+        dm = self.dcma_metrics
         stats = {
             'total_activities': len(self.df),
-            'total_relationships': self.dcma_metrics.get('relationship_types', {}).get('total', 0),
-            'total_milestones': self.dcma_metrics.get('milestones', {}).get('count', 0)
+            'total_relationships': (dm.get('relationship_types') or _EMPTY).get('total', 0),
+            'total_milestones': (dm.get('milestones') or _EMPTY).get('count', 0)
         }
 
         # Date range
-        if 'Start' in self.df.columns and 'Finish' in self.df.columns:
-            stats['project_start'] = self.df['Start'].min().strftime('%Y-%m-%d') if pd.notna(self.df['Start'].min()) else None
-            stats['project_finish'] = self.df['Finish'].max().strftime('%Y-%m-%d') if pd.notna(self.df['Finish'].max()) else None
+        if 'Start' in self._available and 'Finish' in self._available:
+            start = self.df['Start'].min()
+            finish = self.df['Finish'].max()
+            stats['project_start'] = start.strftime('%Y-%m-%d') if pd.notna(start) else None
+            stats['project_finish'] = finish.strftime('%Y-%m-%d') if pd.notna(finish) else None
 
             if stats['project_start'] and stats['project_finish']:
-                duration = (pd.to_datetime(stats['project_finish']) - pd.to_datetime(stats['project_start'])).days
+                # Whole calendar days between the start and finish dates (time of day ignored)
+                duration = (finish.normalize() - start.normalize()).days
                 stats['project_duration_days'] = duration
                 stats['project_duration_months'] = round(duration / 30, 1)
 
         # Activity status breakdown
-        if 'Activity Status' in self.df.columns:
+        if 'Activity Status' in self._available:
             status_counts = self.df['Activity Status'].value_counts().to_dict()
             stats['status_breakdown'] = status_counts
 
         # Critical activities (float <= 5)
-        if 'Total Float' in self.df.columns:
+        if 'Total Float' in self._available:
             critical_count = len(self.df[self.df['Total Float'] <= 5])
             stats['critical_activities'] = critical_count
             stats['critical_percentage'] = round((critical_count / len(self.df) * 100), 2)
@@ -3,9 +3,14 @@ Recommendations Engine
 Generates prioritized, actionable recommendations based on schedule analysis
 """
 
+from collections import Counter
 from typing import Dict, List
 
 
+# Recommendation priorities in display order
+PRIORITY_ORDER = ('high', 'medium', 'low')
+
+
 class RecommendationsEngine:
     """Generates intelligent recommendations for schedule improvement"""
 
@@ -43,9 +48,12 @@ class RecommendationsEngine:
         self._add_bei_recommendations()
         self._add_health_score_recommendations()
 
-        # Sort by priority
-        priority_order = {'high': 1, 'medium': 2, 'low': 3}
-        self.recommendations.sort(key=lambda x: priority_order.get(x['priority'], 4))
+        # Sort by priority - a stable bucket pass (high, medium, low, then anything else)
+        buckets = {priority: [] for priority in PRIORITY_ORDER}
+        unranked = []
+        for rec in self.recommendations:
+            buckets.get(rec['priority'], unranked).append(rec)
+        self.recommendations[:] = [rec for priority in PRIORITY_ORDER for rec in buckets[priority]] + unranked
 
         return self.recommendations
 
@@ -170,14 +178,12 @@ class RecommendationsEngine:
 
     def get_summary(self) -> Dict:
         """Get summary of recommendations"""
-        high_priority = [r for r in self.recommendations if r['priority'] == 'high']
-        medium_priority = [r for r in self.recommendations if r['priority'] == 'medium']
-        low_priority = [r for r in self.recommendations if r['priority'] == 'low']
+        priority_counts = Counter(r['priority'] for r in self.recommendations)
 
         return {
             'total_recommendations': len(self.recommendations),
-            'high_priority_count': len(high_priority),
-            'medium_priority_count': len(medium_priority),
-            'low_priority_count': len(low_priority),
+            'high_priority_count': priority_counts['high'],
+            'medium_priority_count': priority_counts['medium'],
+            'low_priority_count': priority_counts['low'],
             'top_3_recommendations': self.recommendations[:3] if len(self.recommendations) >= 3 else self.recommendations
         }
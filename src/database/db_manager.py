@@ -3,13 +3,46 @@ Database Manager for Pocketbase integration
 Handles all database operations for the Schedule Quality Analyzer
 """
 
+import copy
+import hashlib
+import hmac
 import json
 import os
+from collections import defaultdict
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import streamlit as st
 
 
+def _hash_password(password: str) -> str:
+    """Hex digest stored in place of the plaintext password"""
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+# Default users for testing, built once at import
+_DEFAULT_USERS_CREATED = datetime.now().isoformat()
+_DEFAULT_USERS = (
+    {
+        'id': 'user_001',
+        'email': 'admin@example.com',
+        'username': 'admin',
+        'password_hash': _hash_password('admin123'),
+        'role': 'admin',
+        'created': _DEFAULT_USERS_CREATED,
+        'updated': _DEFAULT_USERS_CREATED
+    },
+    {
+        'id': 'user_002',
+        'email': 'viewer@example.com',
+        'username': 'viewer',
+        'password_hash': _hash_password('viewer123'),
+        'role': 'viewer',
+        'created': _DEFAULT_USERS_CREATED,
+        'updated': _DEFAULT_USERS_CREATED
+    }
+)
+
+
 class DatabaseManager:
     """
     Manages database operations with Pocketbase
@@ -33,46 +66,65 @@ class DatabaseManager:
             st.session_state.analysis_results = []
         if 'audit_log' not in st.session_state:
             st.session_state.audit_log = []
+        if 'audit_by_action' not in st.session_state:
+            self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """
+        Rebuild the lookup indexes kept alongside the session state lists
+        The first record wins for duplicate keys, matching a front-to-back list scan
+        """
+        st.session_state.users_by_username = {}
+        st.session_state.users_by_id = {}
+        for user in st.session_state.users:
+            st.session_state.users_by_username.setdefault(user['username'], user)
+            st.session_state.users_by_id.setdefault(user['id'], user)
+
+        st.session_state.projects_by_id = {}
+        st.session_state.projects_by_code = {}
+        for project in st.session_state.projects:
+            st.session_state.projects_by_id.setdefault(project['id'], project)
+            st.session_state.projects_by_code.setdefault(project['project_code'], project)
+
+        st.session_state.schedules_by_project = defaultdict(list)
+        schedules_by_id = {}
+        for schedule in st.session_state.schedules:
+            schedules_by_id.setdefault(schedule['id'], schedule)
+            st.session_state.schedules_by_project[schedule['project_id']].append(schedule)
+
+        st.session_state.analyses_by_schedule_id = {}
+        for result in st.session_state.analysis_results:
+            st.session_state.analyses_by_schedule_id.setdefault(result['schedule_id'], result)
+
+        st.session_state.schedules_by_id = schedules_by_id
+
+        # Audit log positions per user and per action type
+        st.session_state.audit_by_user = defaultdict(list)
+        audit_by_action = defaultdict(list)
+        for position, log in enumerate(st.session_state.audit_log):
+            st.session_state.audit_by_user[log['user_id']].append(position)
+            audit_by_action[log['action_type']].append(position)
+
+        # Assigned last: its presence marks the indexes as built
+        st.session_state.audit_by_action = audit_by_action
 
     def _get_default_users(self) -> List[Dict]:
-        """Get default users for testing"""
-        return [
-            {
-                'id': 'user_001',
-                'email': 'admin@example.com',
-                'username': 'admin',
-                'password': 'admin123',  # In production, this should be hashed
-                'role': 'admin',
-                'created': datetime.now().isoformat(),
-                'updated': datetime.now().isoformat()
-            },
-            {
-                'id': 'user_002',
-                'email': 'viewer@example.com',
-                'username': 'viewer',
-                'password': 'viewer123',
-                'role': 'viewer',
-                'created': datetime.now().isoformat(),
-                'updated': datetime.now().isoformat()
-            }
-        ]
+        """Get default users for testing (fresh copies, so sessions never share user dicts)"""
+        return copy.deepcopy(list(_DEFAULT_USERS))
 
     # User Management
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
         """Authenticate a user"""
         self._init_session_state()  # Ensure session state is initialized
-        for user in st.session_state.users:
-            if user['username'] == username and user['password'] == password:
-                return user
+        user = st.session_state.users_by_username.get(username)
+        if user is not None and hmac.compare_digest(user.get('password_hash', ''), _hash_password(password)):
+            return user
         return None
 
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
         self._init_session_state()  # Ensure session state is initialized
-        for user in st.session_state.users:
-            if user['id'] == user_id:
-                return user
-        return None
+        return st.session_state.users_by_id.get(user_id)
 
     def create_user(self, email: str, username: str, password: str, role: str = 'viewer') -> Dict:
         """Create a new user"""
@@ -81,12 +133,14 @@ class DatabaseManager:
             'id': f'user_{len(st.session_state.users) + 1:03d}',
             'email': email,
             'username': username,
-            'password': password,  # Should be hashed in production
+            'password_hash': _hash_password(password),
             'role': role,
             'created': datetime.now().isoformat(),
             'updated': datetime.now().isoformat()
         }
         st.session_state.users.append(user)
+        st.session_state.users_by_username.setdefault(username, user)
+        st.session_state.users_by_id.setdefault(user['id'], user)
         return user
 
     # Project Management
@@ -103,6 +157,8 @@ class DatabaseManager:
             'updated': datetime.now().isoformat()
         }
         st.session_state.projects.append(project)
+        st.session_state.projects_by_id.setdefault(project['id'], project)
+        st.session_state.projects_by_code.setdefault(project_code, project)
         self._log_action(created_by, 'create_project', project['id'], {'project_name': project_name})
         return project
 
@@ -114,18 +170,12 @@ class DatabaseManager:
     def get_project_by_id(self, project_id: str) -> Optional[Dict]:
         """Get project by ID"""
         self._init_session_state()  # Ensure session state is initialized
-        for project in st.session_state.projects:
-            if project['id'] == project_id:
-                return project
-        return None
+        return st.session_state.projects_by_id.get(project_id)
 
     def get_project_by_code(self, project_code: str) -> Optional[Dict]:
         """Get project by code"""
         self._init_session_state()  # Ensure session state is initialized
-        for project in st.session_state.projects:
-            if project['project_code'] == project_code:
-                return project
-        return None
+        return st.session_state.projects_by_code.get(project_code)
 
     # Schedule Management
     def create_schedule(self, project_id: str, schedule_data: Dict, file_name: str,
@@ -133,8 +183,7 @@ class DatabaseManager:
         """Create a new schedule"""
         self._init_session_state()  # Ensure session state is initialized
         # Get version number for this project
-        project_schedules = [s for s in st.session_state.schedules if s['project_id'] == project_id]
-        version_number = len(project_schedules) + 1
+        version_number = len(st.session_state.schedules_by_project.get(project_id, [])) + 1
 
         schedule = {
             'id': f'sched_{len(st.session_state.schedules) + 1:03d}',
@@ -147,6 +196,8 @@ class DatabaseManager:
             'analysis_status': 'pending'
         }
         st.session_state.schedules.append(schedule)
+        st.session_state.schedules_by_id.setdefault(schedule['id'], schedule)
+        st.session_state.schedules_by_project[project_id].append(schedule)
         self._log_action(uploaded_by, 'upload_schedule', schedule['id'],
                         {'file_name': file_name, 'project_id': project_id})
         return schedule
@@ -154,45 +205,56 @@ class DatabaseManager:
     def get_schedule_by_id(self, schedule_id: str) -> Optional[Dict]:
         """Get schedule by ID"""
         self._init_session_state()  # Ensure session state is initialized
-        for schedule in st.session_state.schedules:
-            if schedule['id'] == schedule_id:
-                return schedule
-        return None
+        return st.session_state.schedules_by_id.get(schedule_id)
 
     def get_schedules_by_project(self, project_id: str) -> List[Dict]:
         """Get all schedules for a project"""
         self._init_session_state()  # Ensure session state is initialized
-        return [s for s in st.session_state.schedules if s['project_id'] == project_id]
+        return list(st.session_state.schedules_by_project.get(project_id, []))
 
     def update_schedule_status(self, schedule_id: str, status: str):
         """Update schedule analysis status"""
         self._init_session_state()  # Ensure session state is initialized
-        for schedule in st.session_state.schedules:
-            if schedule['id'] == schedule_id:
-                schedule['analysis_status'] = status
-                break
+        schedule = st.session_state.schedules_by_id.get(schedule_id)
+        if schedule is not None:
+            schedule['analysis_status'] = status
 
     def delete_schedule(self, schedule_id: str, user_id: str):
         """Delete a schedule"""
         self._init_session_state()  # Ensure session state is initialized
-        st.session_state.schedules = [s for s in st.session_state.schedules
-                                     if s['id'] != schedule_id]
-        # Also delete associated analysis results
-        st.session_state.analysis_results = [r for r in st.session_state.analysis_results
-                                            if r['schedule_id'] != schedule_id]
+        schedule = st.session_state.schedules_by_id.pop(schedule_id, None)
+        if schedule is not None:
+            schedules = st.session_state.schedules
+            # The index holds the first schedule with this ID, so everything before it is kept
+            position = next(i for i, s in enumerate(schedules) if s is schedule)
+            del schedules[position]
+            self._remove_from_project_index(schedule)
+            # IDs count the list, so a later upload can reuse this one; those copies go too
+            for i in range(len(schedules) - 1, position - 1, -1):
+                if schedules[i]['id'] == schedule_id:
+                    self._remove_from_project_index(schedules.pop(i))
+
+        # Also delete associated analysis results (at most one per schedule)
+        analysis = st.session_state.analyses_by_schedule_id.pop(schedule_id, None)
+        if analysis is not None:
+            position = next(i for i, result in enumerate(st.session_state.analysis_results)
+                            if result is analysis)
+            del st.session_state.analysis_results[position]
         self._log_action(user_id, 'delete_schedule', schedule_id, {})
 
+    def _remove_from_project_index(self, schedule: Dict):
+        """Remove a deleted schedule from its project's schedule list"""
+        project_schedules = st.session_state.schedules_by_project[schedule['project_id']]
+        position = next(i for i, s in enumerate(project_schedules) if s is schedule)
+        del project_schedules[position]
+
     # Analysis Results Management
     def save_analysis_result(self, schedule_id: str, metrics: Dict, issues: List[Dict],
                             recommendations: List[Dict], health_score: float) -> Dict:
         """Save analysis results"""
         self._init_session_state()  # Ensure session state is initialized
         # Check if analysis already exists for this schedule
-        existing = None
-        for i, result in enumerate(st.session_state.analysis_results):
-            if result['schedule_id'] == schedule_id:
-                existing = i
-                break
+        existing = st.session_state.analyses_by_schedule_id.get(schedule_id)
 
         analysis = {
             'id': f'analysis_{len(st.session_state.analysis_results) + 1:03d}',
@@ -205,9 +267,13 @@ class DatabaseManager:
         }
 
         if existing is not None:
-            st.session_state.analysis_results[existing] = analysis
+            # Replace in place so the results list keeps its order
+            position = next(i for i, result in enumerate(st.session_state.analysis_results)
+                            if result is existing)
+            st.session_state.analysis_results[position] = analysis
         else:
             st.session_state.analysis_results.append(analysis)
+        st.session_state.analyses_by_schedule_id[schedule_id] = analysis
 
         # Update schedule status
         self.update_schedule_status(schedule_id, 'complete')
@@ -217,10 +283,7 @@ class DatabaseManager:
     def get_analysis_by_schedule(self, schedule_id: str) -> Optional[Dict]:
         """Get analysis results for a schedule"""
         self._init_session_state()  # Ensure session state is initialized
-        for result in st.session_state.analysis_results:
-            if result['schedule_id'] == schedule_id:
-                return result
-        return None
+        return st.session_state.analyses_by_schedule_id.get(schedule_id)
 
     def get_all_analyses(self) -> List[Dict]:
         """Get all analysis results"""
@@ -239,6 +302,9 @@ class DatabaseManager:
             'details': details,
             'timestamp': datetime.now().isoformat()
         }
+        position = len(st.session_state.audit_log)
+        st.session_state.audit_by_user[user_id].append(position)
+        st.session_state.audit_by_action[action_type].append(position)
         st.session_state.audit_log.append(log_entry)
 
     def get_audit_log(self, user_id: Optional[str] = None,
@@ -246,11 +312,17 @@ class DatabaseManager:
         """Get audit log with optional filters"""
         self._init_session_state()  # Ensure session state is initialized
         logs = st.session_state.audit_log
+        if not user_id and not action_type:
+            return logs
 
+        # Start from the smaller bucket of the filters given, then apply the other filter
+        candidates = []
         if user_id:
-            logs = [log for log in logs if log['user_id'] == user_id]
-
+            candidates.append(st.session_state.audit_by_user.get(user_id, []))
         if action_type:
-            logs = [log for log in logs if log['action_type'] == action_type]
+            candidates.append(st.session_state.audit_by_action.get(action_type, []))
+        positions = min(candidates, key=len)
 
-        return logs
+        return [logs[i] for i in positions
+                if (not user_id or logs[i]['user_id'] == user_id)
+                and (not action_type or logs[i]['action_type'] == action_type)]
@@ -6,12 +6,43 @@ Parses and validates Primavera P6 schedule data
 import pandas as pd
 import numpy as np
 import re
+from pandas.api.types import infer_dtype
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import io
 from src.parsers.wbs_parser import WBSParser
 
 
+# One comma-separated relationship, compiled once for all relationship columns
+# Full format: ActivityID: Type Lag
+# Examples: "A21740: FF 10", "A21750: FS", "A21760: FS -5"
+# Pattern explanation:
+# - (?<![^,])\s*: Start of the string or just after a comma, then optional whitespace
+# - ([A-Za-z0-9_-]+): Activity ID (letters, numbers, underscores, hyphens)
+# - \s*:\s*: Colon with optional whitespace
+# - ([A-Z]{2}): Relationship type (exactly 2 uppercase letters: FS, FF, SS, SF)
+# - \s*([-]?\d+)?: Optional lag (negative or positive integer)
+# - |([A-Za-z0-9_-]+): Otherwise, a bare Activity ID (simple format)
+# - ([^,]*): Rest of the part, up to the next comma
+RELATIONSHIP_PART_RE = re.compile(
+    r'(?<![^,])\s*(?:([A-Za-z0-9_-]+)\s*:\s*([A-Z]{2})\s*([-]?\d+)?|([A-Za-z0-9_-]+))?([^,]*)'
+)
+
+# P6 unit suffixes stripped from column names, applied in this order
+# Suffixes: (d), (h), (%), (wk), (mo), (yr), then spelled-out units
+COLUMN_SUFFIX_RES = tuple(
+    re.compile(pattern, flags=re.IGNORECASE)
+    for pattern in (
+        r'\s*\([dhwmy%]+\)\s*$',
+        r'\s*\(days?\)\s*$',
+        r'\s*\(hours?\)\s*$',
+        r'\s*\(weeks?\)\s*$',
+        r'\s*\(months?\)\s*$',
+        r'\s*\(years?\)\s*$',
+    )
+)
+
+
 class ScheduleParser:
     """Parses P6 schedule CSV exports"""
 
@@ -39,11 +70,35 @@ class ScheduleParser:
         'Resource Names'
     ]
 
+    # Primary Constraint values that pin an activity to a specific date
+    HARD_CONSTRAINTS = frozenset([
+        'Must Start On', 'Must Finish On', 'Start On', 'Finish On',
+        'Mandatory Start', 'Mandatory Finish'
+    ])
+
+    # Flexible constraints - date boundaries
+    FLEXIBLE_CONSTRAINTS = frozenset([
+        'Start On or After', 'Start On or Before',
+        'Finish On or After', 'Finish On or Before'
+    ])
+
+    # Schedule-driven - ALAP, ASAP
+    SCHEDULE_DRIVEN_CONSTRAINTS = frozenset(['As Late As Possible', 'As Soon As Possible'])
+
+    # Constraint category for each known Primary Constraint value; anything else is 'Other'
+    CONSTRAINT_CATEGORIES = {
+        **dict.fromkeys(HARD_CONSTRAINTS, 'Hard'),
+        **dict.fromkeys(FLEXIBLE_CONSTRAINTS, 'Flexible'),
+        **dict.fromkeys(SCHEDULE_DRIVEN_CONSTRAINTS, 'Schedule-Driven')
+    }
+
     def __init__(self):
         """Initialize the parser"""
         self.errors = []
         self.warnings = []
         self.wbs_parser = WBSParser()
+        # Activities DataFrame from the last successful parse_csv call
+        self.df = None
 
     def parse_csv(self, file_content: bytes, file_name: str) -> Dict:
         """
@@ -58,6 +113,7 @@ class ScheduleParser:
         """
         self.errors = []
         self.warnings = []
+        self.df = None
 
         try:
             # Read CSV into DataFrame
@@ -98,6 +154,9 @@ class ScheduleParser:
                 'warnings': self.warnings
             }
 
+            # Keep the frame so analysis can skip rebuilding it from the records
+            self.df = df
+
             return schedule_data
 
         except Exception as e:
@@ -117,29 +176,20 @@ class ScheduleParser:
             """Normalize column name by removing P6 unit suffixes"""
             normalized = col_name.strip()
             # Remove P6 suffixes: (d), (h), (%), etc.
-            normalized = re.sub(r'\s*\([dhwmy%]+\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(days?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(hours?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(weeks?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(months?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(years?\)\s*$', '', normalized, flags=re.IGNORECASE)
+            for suffix_re in COLUMN_SUFFIX_RES:
+                normalized = suffix_re.sub('', normalized)
             return normalized.strip()
 
+        # Lowercased names each column can match, built once:
+        # exact case-insensitive name and normalized name (e.g., "Total Float(d)" matches "Total Float")
+        matchable_names = set()
+        for col in df_columns:
+            matchable_names.add(col.lower())
+            matchable_names.add(normalize_for_matching(col).lower())
+
         for req_col in self.REQUIRED_COLUMNS:
-            if req_col not in df_columns:
-                # Try case-insensitive match and normalized match (without P6 suffixes)
-                found = False
-                for col in df_columns:
-                    # Exact case-insensitive match
-                    if col.lower() == req_col.lower():
-                        found = True
-                        break
-                    # Normalized match (e.g., "Total Float(d)" matches "Total Float")
-                    if normalize_for_matching(col).lower() == req_col.lower():
-                        found = True
-                        break
-                if not found:
-                    missing_columns.append(req_col)
+            if req_col.lower() not in matchable_names:
+                missing_columns.append(req_col)
 
         if missing_columns:
             return {
@@ -162,14 +212,8 @@ class ScheduleParser:
         for col in df.columns:
             # Remove common P6 suffixes while preserving the column name
             normalized = col
-            # Remove suffixes: (d), (h), (%), (wk), (mo), (yr)
-            import re
-            normalized = re.sub(r'\s*\([dhwmy%]+\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(days?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(hours?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(weeks?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(months?\)\s*$', '', normalized, flags=re.IGNORECASE)
-            normalized = re.sub(r'\s*\(years?\)\s*$', '', normalized, flags=re.IGNORECASE)
+            for suffix_re in COLUMN_SUFFIX_RES:
+                normalized = suffix_re.sub('', normalized)
             normalized_columns[col] = normalized.strip()
 
         # Rename columns with normalized names
@@ -181,14 +225,20 @@ class ScheduleParser:
             for old_name, new_name in renamed:
                 self.warnings.append(f"Normalized column name: '{old_name}' → '{new_name}'")
 
-        # Strip whitespace from string columns
+        # Strip whitespace from string columns and replace 'nan'/'None'/empty strings
+        # with actual NaN, producing each cleaned column once
         for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].astype(str).str.strip()
-
-        # Replace 'nan' strings with actual NaN
-        df = df.replace('nan', np.nan)
-        df = df.replace('None', np.nan)
-        df = df.replace('', np.nan)
+            values = df[col]
+            if infer_dtype(values, skipna=True) == 'string':
+                # All text already - strip in place of a full astype(str) copy
+                values = values.str.strip()
+                blank = values.isna() | values.isin(('nan', 'None', ''))
+            else:
+                # Mixed values (e.g. numbers alongside text) are stringified first
+                values = values.astype(str).str.strip()
+                blank = values.isin(('nan', 'None', ''))
+            # infer_objects keeps all-missing columns numeric (NaN), as a frame-wide replace did
+            df[col] = values.mask(blank).infer_objects()
 
         # Ensure numeric columns
         numeric_columns = ['Total Float', 'Free Float', 'At Completion Duration']
@@ -213,14 +263,10 @@ class ScheduleParser:
 
         # Parse Predecessors - prioritize "Predecessor Details" which has full relationship notation
         if 'Predecessor Details' in df.columns:
-            df['predecessor_list'] = df['Predecessor Details'].apply(
-                lambda x: self._parse_relationship_string(x, expect_full_format=True) if pd.notna(x) else []
-            )
+            df['predecessor_list'] = self._parse_relationship_column(df['Predecessor Details'], expect_full_format=True)
         elif 'Predecessors' in df.columns:
             # Fallback to simple Predecessors column (Activity IDs only, default to FS with 0 lag)
-            df['predecessor_list'] = df['Predecessors'].apply(
-                lambda x: self._parse_relationship_string(x, expect_full_format=False) if pd.notna(x) else []
-            )
+            df['predecessor_list'] = self._parse_relationship_column(df['Predecessors'], expect_full_format=False)
             self.warnings.append("⚠️  Using 'Predecessors' column (Activity IDs only, no relationship types or lags). Relationship metrics may not be accurate. Recommend using 'Predecessor Details' column for full relationship information (format: 'ActivityID: Type Lag', e.g., 'A100: FF 10').")
         else:
             df['predecessor_list'] = [[] for _ in range(len(df))]
@@ -228,14 +274,10 @@ class ScheduleParser:
 
         # Parse Successors - prioritize "Successor Details" which has full relationship notation
         if 'Successor Details' in df.columns:
-            df['successor_list'] = df['Successor Details'].apply(
-                lambda x: self._parse_relationship_string(x, expect_full_format=True) if pd.notna(x) else []
-            )
+            df['successor_list'] = self._parse_relationship_column(df['Successor Details'], expect_full_format=True)
         elif 'Successors' in df.columns:
             # Fallback to simple Successors column (Activity IDs only, default to FS with 0 lag)
-            df['successor_list'] = df['Successors'].apply(
-                lambda x: self._parse_relationship_string(x, expect_full_format=False) if pd.notna(x) else []
-            )
+            df['successor_list'] = self._parse_relationship_column(df['Successors'], expect_full_format=False)
             self.warnings.append("⚠️  Using 'Successors' column (Activity IDs only, no relationship types or lags). Recommend using 'Successor Details' column for full relationship information.")
         else:
             df['successor_list'] = [[] for _ in range(len(df))]
@@ -243,12 +285,12 @@ class ScheduleParser:
 
         return df
 
-    def _parse_relationship_string(self, rel_string: str, expect_full_format: bool = True) -> List[Dict]:
+    def _parse_relationship_column(self, column: pd.Series, expect_full_format: bool = True) -> List[List[Dict]]:
         """
-        Parse relationship string into structured format
+        Parse a whole relationship column into structured format
 
         Args:
-            rel_string: The relationship string to parse
+            column: The relationship strings, one per activity
             expect_full_format: If True, expects "ActivityID: Type Lag" format (from Detail columns)
                               If False, accepts "ActivityID" only (from simple columns)
 
@@ -257,53 +299,40 @@ class ScheduleParser:
             Simple format: 'A21740, A21750, A21760'
 
         Returns:
-            List of relationship dictionaries with 'activity', 'type', and 'lag' keys
+            One list of relationship dictionaries with 'activity', 'type', and 'lag' keys per activity
         """
-        relationships = []
+        relationships = [[] for _ in range(len(column))]
 
-        if not rel_string or pd.isna(rel_string) or str(rel_string).lower() == 'nan':
+        # Skip empty/NaN cells, keyed by activity position
+        text = pd.Series(column.to_numpy(), dtype=object)
+        text = text[text.notna() & text.astype(bool)].astype(str)
+        text = text[text.str.lower() != 'nan']
+        if text.empty:
             return relationships
 
-        # Split by comma for multiple relationships
-        parts = str(rel_string).split(',')
-
-        for part in parts:
-            part = part.strip()
-            if not part:
-                continue
-
-            # Try to match full format: ActivityID: Type Lag
-            # Examples: "A21740: FF 10", "A21750: FS", "A21760: FS -5"
-            # Pattern explanation:
-            # - ([A-Za-z0-9_-]+): Activity ID (letters, numbers, underscores, hyphens)
-            # - \s*:\s*: Colon with optional whitespace
-            # - ([A-Z]{2}): Relationship type (exactly 2 uppercase letters: FS, FF, SS, SF)
-            # - \s*([-]?\d+)?: Optional lag (negative or positive integer)
-            match = re.match(r'([A-Za-z0-9_-]+)\s*:\s*([A-Z]{2})\s*([-]?\d+)?', part)
-
-            if match:
-                activity_id = match.group(1)
-                rel_type = match.group(2)
-                lag = int(match.group(3)) if match.group(3) else 0
-
-                relationships.append({
-                    'activity': activity_id,
-                    'type': rel_type,
-                    'lag': lag
-                })
-            elif not expect_full_format:
-                # Fallback for simple format (Activity ID only)
-                # Only use this for simple "Predecessors"/"Successors" columns
-                simple_match = re.match(r'([A-Za-z0-9_-]+)', part)
-                if simple_match:
-                    relationships.append({
-                        'activity': simple_match.group(1),
-                        'type': 'FS',  # Default to Finish-to-Start
-                        'lag': 0
+        # One regex pass per cell finds every comma-separated part, matched at its start
+        matches = text.str.findall(RELATIONSHIP_PART_RE)
+        for position, parts in zip(text.index.tolist(), matches.tolist()):
+            for activity_id, rel_type, lag, simple_id, rest in parts:
+                if activity_id:
+                    relationships[position].append({
+                        'activity': activity_id,
+                        'type': rel_type,
+                        'lag': int(lag) if lag else 0
                     })
-            else:
-                # If we expect full format but didn't match, log a warning
-                self.warnings.append(f"Could not parse relationship: '{part}'. Expected format: 'ActivityID: Type Lag'")
+                elif not expect_full_format:
+                    # Fallback for simple format (Activity ID only)
+                    # Only use this for simple "Predecessors"/"Successors" columns
+                    if simple_id:
+                        relationships[position].append({
+                            'activity': simple_id,
+                            'type': 'FS',  # Default to Finish-to-Start
+                            'lag': 0
+                        })
+                elif simple_id or rest:
+                    # If we expect full format but didn't match, log a warning
+                    part = (simple_id + rest).rstrip()
+                    self.warnings.append(f"Could not parse relationship: '{part}'. Expected format: 'ActivityID: Type Lag'")
 
         return relationships
 
@@ -311,59 +340,62 @@ class ScheduleParser:
         """Calculate derived fields"""
 
         # Calculate duration from dates if not provided
-        if 'Start' in df.columns and 'Finish' in df.columns:
-            df['calculated_duration'] = (df['Finish'] - df['Start']).dt.days
+        # (only used as a fallback where At Completion Duration is missing)
+        if 'At Completion Duration' not in df.columns and 'Start' in df.columns and 'Finish' in df.columns:
+            # Whole days straight from the timedelta64 array; NaN where either date is missing
+            delta = (df['Finish'] - df['Start']).to_numpy()
+            missing_dates = np.isnat(delta)
+            with np.errstate(invalid='ignore'):
+                days = delta // np.timedelta64(1, 'D')
+            df['calculated_duration'] = np.where(missing_dates, np.nan, days) if missing_dates.any() else days
+
+        # Relationship lists are all empty when the export has no relationship column,
+        # so the logic flags and lag counts are constants there
+        has_predecessors = 'Predecessor Details' in df.columns or 'Predecessors' in df.columns
+        has_successors = 'Successor Details' in df.columns or 'Successors' in df.columns
+
+        if has_predecessors:
+            predecessor_lists = df['predecessor_list'].tolist()
+            list_sizes = np.fromiter((len(rels) for rels in predecessor_lists), dtype=np.int64, count=len(df))
+        else:
+            list_sizes = np.zeros(len(df), dtype=np.int64)
 
         # Determine if activity has missing logic
-        df['missing_predecessor'] = df['predecessor_list'].apply(lambda x: len(x) == 0)
-        df['missing_successor'] = df['successor_list'].apply(lambda x: len(x) == 0)
+        df['missing_predecessor'] = list_sizes == 0
+        if has_successors:
+            successor_sizes = np.fromiter((len(rels) for rels in df['successor_list'].tolist()), dtype=np.int64, count=len(df))
+            df['missing_successor'] = successor_sizes == 0
+        else:
+            df['missing_successor'] = True
         df['missing_logic'] = df['missing_predecessor'] | df['missing_successor']
 
-        # Count negative and positive lags
-        df['negative_lag_count'] = df['predecessor_list'].apply(
-            lambda x: sum(1 for rel in x if rel.get('lag', 0) < 0)
-        )
-        df['positive_lag_count'] = df['predecessor_list'].apply(
-            lambda x: sum(1 for rel in x if rel.get('lag', 0) > 0)
-        )
+        # Count negative and positive lags in one sweep over the flattened predecessor lags
+        if has_predecessors:
+            row_idx = np.repeat(np.arange(len(df)), list_sizes)
+            # float64 keeps oversized integer lags representable; only the sign is used
+            lags = np.fromiter(
+                (rel.get('lag', 0) for rels in predecessor_lists for rel in rels),
+                dtype=np.float64, count=int(list_sizes.sum())
+            )
+            # Per-activity counts are small - int32 halves the columns versus bincount's int64
+            df['negative_lag_count'] = np.bincount(row_idx[lags < 0], minlength=len(df)).astype(np.int32)
+            df['positive_lag_count'] = np.bincount(row_idx[lags > 0], minlength=len(df)).astype(np.int32)
+        else:
+            df['negative_lag_count'] = np.zeros(len(df), dtype=np.int32)
+            df['positive_lag_count'] = np.zeros(len(df), dtype=np.int32)
 
         # Check for hard constraints
         if 'Primary Constraint' in df.columns:
-            hard_constraints = ['Must Start On', 'Must Finish On', 'Start On', 'Finish On',
-                               'Mandatory Start', 'Mandatory Finish']
-            df['has_hard_constraint'] = df['Primary Constraint'].apply(
-                lambda x: str(x) in hard_constraints if pd.notna(x) else False
+            # Categorize ALL constraint types with one dictionary lookup per value
+            # (values are already stripped by _clean_data)
+            constraints = df['Primary Constraint']
+            categories = (
+                constraints.map(self.CONSTRAINT_CATEGORIES)
+                .fillna('Other')
+                .where(constraints.notna(), 'None')
             )
-
-            # Categorize ALL constraint types
-            def categorize_constraint(constraint):
-                """Categorize constraint into Hard, Flexible, or Schedule-Driven"""
-                if pd.isna(constraint):
-                    return 'None'
-
-                constraint_str = str(constraint).strip()
-
-                # Hard constraints - specific date required
-                hard = ['Must Start On', 'Must Finish On', 'Start On', 'Finish On',
-                       'Mandatory Start', 'Mandatory Finish']
-                if constraint_str in hard:
-                    return 'Hard'
-
-                # Flexible constraints - date boundaries
-                flexible = ['Start On or After', 'Start On or Before',
-                           'Finish On or After', 'Finish On or Before']
-                if constraint_str in flexible:
-                    return 'Flexible'
-
-                # Schedule-driven - ALAP, ASAP
-                schedule_driven = ['As Late As Possible', 'As Soon As Possible']
-                if constraint_str in schedule_driven:
-                    return 'Schedule-Driven'
-
-                # Other/Unknown
-                return 'Other'
-
-            df['constraint_category'] = df['Primary Constraint'].apply(categorize_constraint)
+            df['has_hard_constraint'] = categories == 'Hard'
+            df['constraint_category'] = categories
 
             # Flag activities with ANY constraint (excluding None)
             df['has_any_constraint'] = df['constraint_category'] != 'None'
@@ -417,17 +449,22 @@ class ScheduleParser:
 
     def _extract_metadata(self, df: pd.DataFrame) -> Dict:
         """Extract metadata about the schedule"""
+        # min/max skip NaT and return NaT for an all-missing column - one scan per date column
+        start = df['Start'].min() if 'Start' in df.columns else pd.NaT
+        finish = df['Finish'].max() if 'Finish' in df.columns else pd.NaT
+
         metadata = {
             'total_activities': len(df),
             'activity_statuses': df['Activity Status'].value_counts().to_dict() if 'Activity Status' in df.columns else {},
             'date_range': {
-                'start': df['Start'].min().isoformat() if 'Start' in df.columns and not df['Start'].isna().all() else None,
-                'finish': df['Finish'].max().isoformat() if 'Finish' in df.columns and not df['Finish'].isna().all() else None
+                'start': start.isoformat() if pd.notna(start) else None,
+                'finish': finish.isoformat() if pd.notna(finish) else None
             },
             'has_wbs': 'WBS Code' in df.columns,
             'has_resources': 'Resource Names' in df.columns,
-            'activities_with_missing_logic': int(df['missing_logic'].sum()) if 'missing_logic' in df.columns else 0,
-            'activities_with_hard_constraints': int(df['has_hard_constraint'].sum()) if 'has_hard_constraint' in df.columns else 0
+            # The derived flags are numpy bool columns - count them on the raw arrays
+            'activities_with_missing_logic': int(np.count_nonzero(df['missing_logic'].to_numpy())) if 'missing_logic' in df.columns else 0,
+            'activities_with_hard_constraints': int(np.count_nonzero(df['has_hard_constraint'].to_numpy())) if 'has_hard_constraint' in df.columns else 0
         }
 
         return metadata
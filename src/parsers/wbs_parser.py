@@ -4,6 +4,7 @@ Parses hierarchical WBS codes with period (.) delimiters
 """
 
 from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -81,15 +82,30 @@ class WBSParser:
         # Reset max depth
         self.max_depth = 0
 
-        # Parse each WBS code
-        parsed_wbs = df[wbs_column].apply(self.parse_wbs_code)
+        # Parse all WBS codes at once with the string accessor (same rules as parse_wbs_code)
+        codes = df[wbs_column]
+        wbs_str = codes.astype(str).str.strip()
+        # Missing, empty/blank and other falsy codes have no WBS
+        has_wbs = codes.notna() & (wbs_str != '') & (codes != 0)
+        wbs_full = wbs_str.where(has_wbs, None)
 
-        # Convert list of dicts to DataFrame
-        wbs_df = pd.DataFrame(parsed_wbs.tolist())
+        # Split by period (.) to get hierarchical levels, one column per level
+        levels = wbs_full.str.split('.', expand=True)
+        wbs_depth = levels.notna().sum(axis=1) if len(levels.columns) else pd.Series(0, index=df.index)
 
-        # Add parsed columns to original dataframe
-        for col in wbs_df.columns:
-            df[col] = wbs_df[col]
+        df['wbs_full'] = wbs_full
+        df['wbs_depth'] = wbs_depth.astype('int64')
+
+        # Store each level (up to 6 levels: 0-5); levels beyond a code's depth are None
+        for i in range(6):
+            if i < len(levels.columns):
+                level = levels[i].str.strip()
+                df[f'wbs_level_{i}'] = level.where(level.notna(), None)
+            else:
+                df[f'wbs_level_{i}'] = None
+
+        # Update max depth
+        self.max_depth = int(wbs_depth.max()) if len(wbs_depth) else 0
 
         return df
 
@@ -121,17 +137,33 @@ class WBSParser:
         if 'wbs_level_0' not in df.columns:
             return hierarchy
 
+        # Consecutive level columns up to the deepest code
+        level_columns = []
+        for i in range(self.max_depth):
+            level_key = f'wbs_level_{i}'
+            if level_key not in df.columns:
+                break
+            level_columns.append(level_key)
+
+        if not level_columns:
+            self.wbs_hierarchy = hierarchy
+            return hierarchy
+
+        # Count activities per distinct WBS path (first-seen order), so the tree is
+        # walked once per path rather than once per activity
+        path_counts = df.groupby(level_columns, sort=False, dropna=False).size()
+
         # Build tree structure
-        for _, row in df.iterrows():
+        for path, count in path_counts.items():
+            if not isinstance(path, tuple):
+                path = (path,)
             current_level = hierarchy
 
             # Traverse through WBS levels
-            for i in range(self.max_depth):
-                level_key = f'wbs_level_{i}'
-                if level_key not in row or pd.isna(row[level_key]):
+            for i, wbs_value in enumerate(path):
+                if pd.isna(wbs_value):
                     break
 
-                wbs_value = row[level_key]
                 if wbs_value not in current_level:
                     current_level[wbs_value] = {
                         'children': {},
@@ -139,7 +171,7 @@ class WBSParser:
                         'level': i
                     }
 
-                current_level[wbs_value]['activity_count'] += 1
+                current_level[wbs_value]['activity_count'] += count
                 current_level = current_level[wbs_value]['children']
 
         self.wbs_hierarchy = hierarchy
@@ -203,15 +235,21 @@ class WBSParser:
             pct = (missing_count / len(df)) * 100
             warnings.append(f"{missing_count} activities ({pct:.1f}%) have missing WBS codes")
 
-        # Check for inconsistent depth
         if 'wbs_depth' in df.columns:
-            depths = df['wbs_depth'].value_counts()
-            if len(depths) > 3:
+            # Depths are small non-negative ints - one bincount serves both checks
+            depth_values = df['wbs_depth'].to_numpy()
+            depth_counts = np.bincount(depth_values)
+
+            # Check for inconsistent depth
+            if np.count_nonzero(depth_counts) > 3:
+                # Same ordering as value_counts: most frequent first, ties in first-seen order
+                unique_depths, first_seen = np.unique(depth_values, return_index=True)
+                seen_order = unique_depths[np.argsort(first_seen)]
+                depths = pd.Series(depth_counts[seen_order], index=seen_order).sort_values(ascending=False)
                 warnings.append(f"WBS depth varies significantly: {dict(depths.head(5))}")
 
-        # Check for very short WBS codes (might indicate issues)
-        if 'wbs_depth' in df.columns:
-            shallow = (df['wbs_depth'] < 2).sum()
+            # Check for very short WBS codes (might indicate issues)
+            shallow = depth_counts[:2].sum()
             if shallow > 0 and shallow < len(df):
                 warnings.append(f"{shallow} activities have shallow WBS codes (depth < 2)")
 
@@ -7,13 +7,23 @@ from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from datetime import datetime
-from typing import Dict, List
+from typing import BinaryIO, Dict, List, Optional
 import io
 
 
 class DOCXGenerator:
     """Generates executive summary reports in DOCX format"""
 
+    # Text color for each health score rating; unrated text stays black
+    RATING_COLORS = {
+        'Excellent': RGBColor(0, 128, 0),    # Green
+        'Good': RGBColor(0, 0, 255),          # Blue
+        'Fair': RGBColor(255, 165, 0),        # Orange
+        'Poor': RGBColor(255, 140, 0),        # Dark Orange
+        'Critical': RGBColor(255, 0, 0)       # Red
+    }
+    DEFAULT_COLOR = RGBColor(0, 0, 0)
+
     def __init__(self, project_name: str, schedule_data: Dict, analysis_results: Dict):
         """
         Initialize DOCX generator
@@ -28,8 +38,17 @@ class DOCXGenerator:
         self.analysis_results = analysis_results
         self.document = Document()
 
-    def generate(self) -> bytes:
-        """Generate the DOCX report and return as bytes"""
+    def generate(self, out: Optional[BinaryIO] = None) -> Optional[bytes]:
+        """
+        Generate the DOCX report
+
+        Args:
+            out: Writable binary stream to save the report into (e.g. an open file).
+                When omitted the report is returned as bytes.
+
+        Returns:
+            Report bytes, or None when written to out
+        """
         # Set up document properties
         self._setup_document()
 
@@ -44,6 +63,11 @@ class DOCXGenerator:
         self._add_recommendations()
         self._add_appendix()
 
+        # Save straight into the caller's stream - no intermediate copy of the document
+        if out is not None:
+            self.document.save(out)
+            return None
+
         # Save to bytes
         file_stream = io.BytesIO()
         self.document.save(file_stream)
@@ -57,6 +81,9 @@ class DOCXGenerator:
         self.document.core_properties.author = "Schedule Quality Analyzer"
         self.document.core_properties.created = datetime.now()
 
+        # Table style resolved once and shared by every table in the report
+        self._table_style = self.document.styles['Light Grid Accent 1']
+
     def _add_cover_page(self):
         """Add cover page"""
         # Title
@@ -168,36 +195,30 @@ The schedule contains {stats['total_activities']} activities with an overall hea
             self.document.add_paragraph()
 
             # Create table for metrics
-            table = self.document.add_table(rows=1, cols=4)
-            table.style = 'Light Grid Accent 1'
+            table = self.document.add_table(rows=0, cols=4)
+            table.style = self._table_style
 
             # Header row
-            hdr_cells = table.rows[0].cells
-            hdr_cells[0].text = '#'
-            hdr_cells[1].text = 'Metric'
-            hdr_cells[2].text = 'Status'
-            hdr_cells[3].text = 'Result'
+            self._add_table_row(table, ['#', 'Metric', 'Status', 'Result'])
 
             # Add metrics for this category
             for metric in cat_metrics:
-                row_cells = table.add_row().cells
-                row_cells[0].text = str(metric['number'])
-                row_cells[1].text = metric['name']
-
                 # Status with symbols
                 status = metric['status'].upper()
                 if status == 'PASS':
-                    row_cells[2].text = '✓ PASS'
+                    status_text = '✓ PASS'
                 elif status == 'FAIL':
-                    row_cells[2].text = '✗ FAIL'
+                    status_text = '✗ FAIL'
                 elif status == 'N/A':
-                    row_cells[2].text = '○ N/A'
+                    status_text = '○ N/A'
                 elif status == 'MANUAL':
-                    row_cells[2].text = '◐ MANUAL'
+                    status_text = '◐ MANUAL'
                 else:
-                    row_cells[2].text = '? UNKNOWN'
+                    status_text = '? UNKNOWN'
 
-                row_cells[3].text = metric['description']
+                self._add_table_row(table, [
+                    str(metric['number']), metric['name'], status_text, metric['description']
+                ])
 
             self.document.add_paragraph()
 
@@ -231,14 +252,11 @@ The schedule contains {stats['total_activities']} activities with an overall hea
         dcma_metrics = self.analysis_results['dcma_metrics']
 
         # Create checklist table
-        table = self.document.add_table(rows=1, cols=3)
-        table.style = 'Light Grid Accent 1'
+        table = self.document.add_table(rows=0, cols=3)
+        table.style = self._table_style
 
         # Header row
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = 'Metric'
-        hdr_cells[1].text = 'Status'
-        hdr_cells[2].text = 'Result'
+        self._add_table_row(table, ['Metric', 'Status', 'Result'])
 
         # Add metrics
         checklist = [
@@ -253,10 +271,7 @@ The schedule contains {stats['total_activities']} activities with an overall hea
         ]
 
         for metric_name, status, result in checklist:
-            row_cells = table.add_row().cells
-            row_cells[0].text = metric_name
-            row_cells[1].text = status.upper()
-            row_cells[2].text = result
+            self._add_table_row(table, [metric_name, status.upper(), result])
 
         self.document.add_paragraph()
 
@@ -285,41 +300,38 @@ The schedule contains {stats['total_activities']} activities with an overall hea
         # Create breakdown table
         self.document.add_heading('Missing Logic Breakdown', level=2)
 
-        table = self.document.add_table(rows=1, cols=3)
-        table.style = 'Light Grid Accent 1'
+        table = self.document.add_table(rows=0, cols=3)
+        table.style = self._table_style
 
         # Header row
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = 'Category'
-        hdr_cells[1].text = 'Count'
-        hdr_cells[2].text = 'Description'
+        self._add_table_row(table, ['Category', 'Count', 'Description'])
 
         # Total
-        row_cells = table.add_row().cells
-        row_cells[0].text = 'Total Missing Logic'
-        row_cells[1].text = str(total_missing)
-        row_cells[2].text = 'Unique activities with missing predecessor and/or successor'
+        self._add_table_row(table, [
+            'Total Missing Logic', str(total_missing),
+            'Unique activities with missing predecessor and/or successor'
+        ])
 
         # Missing predecessor only
         pred_only = missing_logic_info.get('missing_predecessor_only_count', 0)
-        row_cells = table.add_row().cells
-        row_cells[0].text = '  ├─ Missing Predecessor Only'
-        row_cells[1].text = str(pred_only)
-        row_cells[2].text = 'Activities that need predecessors added'
+        self._add_table_row(table, [
+            '  ├─ Missing Predecessor Only', str(pred_only),
+            'Activities that need predecessors added'
+        ])
 
         # Missing successor only
         succ_only = missing_logic_info.get('missing_successor_only_count', 0)
-        row_cells = table.add_row().cells
-        row_cells[0].text = '  ├─ Missing Successor Only'
-        row_cells[1].text = str(succ_only)
-        row_cells[2].text = 'Activities that need successors added'
+        self._add_table_row(table, [
+            '  ├─ Missing Successor Only', str(succ_only),
+            'Activities that need successors added'
+        ])
 
         # Missing both
         both_count = missing_logic_info.get('missing_both_count', 0)
-        row_cells = table.add_row().cells
-        row_cells[0].text = '  └─ Missing Both'
-        row_cells[1].text = str(both_count)
-        row_cells[2].text = 'Activities that need both predecessors and successors'
+        self._add_table_row(table, [
+            '  └─ Missing Both', str(both_count),
+            'Activities that need both predecessors and successors'
+        ])
 
         self.document.add_paragraph()
 
@@ -406,31 +418,27 @@ The schedule contains {stats['total_activities']} activities with an overall hea
             self.document.add_heading('WBS Level 1 - Phases', level=2)
 
             # Create table
-            table = self.document.add_table(rows=1, cols=7)
-            table.style = 'Light Grid Accent 1'
+            table = self.document.add_table(rows=0, cols=7)
+            table.style = self._table_style
 
             # Header
-            hdr_cells = table.rows[0].cells
-            hdr_cells[0].text = 'Phase'
-            hdr_cells[1].text = 'Activities'
-            hdr_cells[2].text = 'Avg Float'
-            hdr_cells[3].text = 'Critical'
-            hdr_cells[4].text = 'Negative'
-            hdr_cells[5].text = 'Health Score'
-            hdr_cells[6].text = 'Rating'
+            self._add_table_row(table, [
+                'Phase', 'Activities', 'Avg Float', 'Critical', 'Negative', 'Health Score', 'Rating'
+            ])
 
             # Add phase data
             for wbs_code, stats in sorted(level1.items()):
-                row_cells = table.add_row().cells
                 health_score = stats.get('health_score', {})
 
-                row_cells[0].text = f"Phase {wbs_code}"
-                row_cells[1].text = str(stats.get('activity_count', 0))
-                row_cells[2].text = f"{stats.get('avg_float', 0):.1f}"
-                row_cells[3].text = str(stats.get('critical_count', 0))
-                row_cells[4].text = str(stats.get('negative_float_count', 0))
-                row_cells[5].text = f"{health_score.get('score', 0):.0f}/100"
-                row_cells[6].text = health_score.get('rating', 'Unknown')
+                self._add_table_row(table, [
+                    f"Phase {wbs_code}",
+                    str(stats.get('activity_count', 0)),
+                    f"{stats.get('avg_float', 0):.1f}",
+                    str(stats.get('critical_count', 0)),
+                    str(stats.get('negative_float_count', 0)),
+                    f"{health_score.get('score', 0):.0f}/100",
+                    health_score.get('rating', 'Unknown')
+                ])
 
             self.document.add_paragraph()
 
@@ -440,42 +448,35 @@ The schedule contains {stats['total_activities']} activities with an overall hea
             self.document.add_heading('WBS Level 2 - Areas', level=2)
 
             # Create table
-            table = self.document.add_table(rows=1, cols=7)
-            table.style = 'Light Grid Accent 1'
+            table = self.document.add_table(rows=0, cols=7)
+            table.style = self._table_style
 
             # Header
-            hdr_cells = table.rows[0].cells
-            hdr_cells[0].text = 'Area'
-            hdr_cells[1].text = 'Activities'
-            hdr_cells[2].text = 'Avg Float'
-            hdr_cells[3].text = 'Critical'
-            hdr_cells[4].text = '% Critical'
-            hdr_cells[5].text = 'Health Score'
-            hdr_cells[6].text = 'Rating'
-
-            # Add area data (sorted by health score to show problem areas first)
-            areas_with_scores = []
-            for wbs_code, stats in level2.items():
-                health_score = stats.get('health_score', {})
-                areas_with_scores.append((wbs_code, stats, health_score.get('score', 0)))
+            self._add_table_row(table, [
+                'Area', 'Activities', 'Avg Float', 'Critical', '% Critical', 'Health Score', 'Rating'
+            ])
 
-            areas_with_scores.sort(key=lambda x: x[2])  # Sort by health score ascending
+            # Add area data (sorted by health score ascending to show problem areas first)
+            sorted_areas = sorted(
+                level2.items(), key=lambda item: item[1].get('health_score', {}).get('score', 0)
+            )
 
-            for wbs_code, stats, _ in areas_with_scores:
-                row_cells = table.add_row().cells
+            for wbs_code, stats in sorted_areas:
                 health_score = stats.get('health_score', {})
 
                 activity_count = stats.get('activity_count', 0)
                 critical_count = stats.get('critical_count', 0)
                 pct_critical = (critical_count / activity_count * 100) if activity_count > 0 else 0
 
-                row_cells[0].text = f"Area {wbs_code}"
-                row_cells[1].text = str(activity_count)
-                row_cells[2].text = f"{stats.get('avg_float', 0):.1f}"
-                row_cells[3].text = str(critical_count)
-                row_cells[4].text = f"{pct_critical:.0f}%"
-                row_cells[5].text = f"{health_score.get('score', 0):.0f}/100"
-                row_cells[6].text = health_score.get('rating', 'Unknown')
+                self._add_table_row(table, [
+                    f"Area {wbs_code}",
+                    str(activity_count),
+                    f"{stats.get('avg_float', 0):.1f}",
+                    str(critical_count),
+                    f"{pct_critical:.0f}%",
+                    f"{health_score.get('score', 0):.0f}/100",
+                    health_score.get('rating', 'Unknown')
+                ])
 
             self.document.add_paragraph()
 
@@ -508,23 +509,17 @@ The schedule contains {stats['total_activities']} activities with an overall hea
             return
 
         # Create table
-        table = self.document.add_table(rows=1, cols=4)
-        table.style = 'Light Grid Accent 1'
+        table = self.document.add_table(rows=0, cols=4)
+        table.style = self._table_style
 
         # Header
-        hdr_cells = table.rows[0].cells
-        hdr_cells[0].text = 'Priority'
-        hdr_cells[1].text = 'Category'
-        hdr_cells[2].text = 'Issue'
-        hdr_cells[3].text = 'Count'
+        self._add_table_row(table, ['Priority', 'Category', 'Issue', 'Count'])
 
         # Add issues
         for issue in issues:
-            row_cells = table.add_row().cells
-            row_cells[0].text = issue['severity'].upper()
-            row_cells[1].text = issue['category']
-            row_cells[2].text = issue['title']
-            row_cells[3].text = str(issue.get('count', 0))
+            self._add_table_row(table, [
+                issue['severity'].upper(), issue['category'], issue['title'], str(issue.get('count', 0))
+            ])
 
         self.document.add_paragraph()
 
@@ -538,10 +533,13 @@ The schedule contains {stats['total_activities']} activities with an overall hea
             self.document.add_paragraph('No recommendations at this time.')
             return
 
-        # Group by priority
-        high = [r for r in recommendations if r['priority'] == 'high']
-        medium = [r for r in recommendations if r['priority'] == 'medium']
-        low = [r for r in recommendations if r['priority'] == 'low']
+        # Group by priority in one pass (the report lists high and medium priorities)
+        by_priority = {'high': [], 'medium': []}
+        for rec in recommendations:
+            bucket = by_priority.get(rec['priority'])
+            if bucket is not None:
+                bucket.append(rec)
+        high, medium = by_priority['high'], by_priority['medium']
 
         # High priority
         if high:
@@ -598,13 +596,25 @@ Key Metrics Definitions:
 
         self.document.add_paragraph(methodology_text.strip())
 
+    def _add_table_row(self, table, values: List[str]):
+        """
+        Append a row of plain-text cells to a table
+
+        Builds the row XML directly - the same markup as table.add_row() followed by
+        cell.text assignments, without creating a _Row/_Cell wrapper per cell.
+
+        Args:
+            table: python-docx Table to append to
+            values: Cell text for each grid column, in order
+        """
+        tbl = table._tbl
+        tr = tbl.add_tr()
+        for grid_col, value in zip(tbl.tblGrid.gridCol_lst, values):
+            tc = tr.add_tc()
+            if grid_col.w is not None:
+                tc.width = grid_col.w
+            tc.p_lst[0].add_r().text = value
+
     def _set_color_by_rating(self, run, rating: str):
         """Set text color based on rating"""
-        color_map = {
-            'Excellent': RGBColor(0, 128, 0),    # Green
-            'Good': RGBColor(0, 0, 255),          # Blue
-            'Fair': RGBColor(255, 165, 0),        # Orange
-            'Poor': RGBColor(255, 140, 0),        # Dark Orange
-            'Critical': RGBColor(255, 0, 0)       # Red
-        }
-        run.font.color.rgb = color_map.get(rating, RGBColor(0, 0, 0))
+        run.font.color.rgb = self.RATING_COLORS.get(rating, self.DEFAULT_COLOR)
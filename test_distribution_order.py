@@ -0,0 +1,75 @@
+"""
+Test script to verify value distributions keep value_counts order when counts tie
+"""
+
+import pandas as pd
+from src.analysis.dcma_analyzer import DCMAAnalyzer
+
+print("=" * 80)
+print("Testing Distribution Order With Tied Counts")
+print("=" * 80)
+print()
+
+# Two activities per status and per type, first seen in non-alphabetical order
+activities = []
+statuses = ['Not Started', 'In Progress', 'Completed']
+types = ['Task Dependent', 'Finish Milestone', 'Level of Effort']
+for i in range(6):
+    activities.append({
+        'Activity ID': f'A{i}',
+        'Activity Name': f'Activity {i}',
+        'Activity Status': statuses[i % 3],
+        'Activity Type': types[i % 3],
+        # Area 2 sees 'Completed' before 'Not Started'
+        'WBS Code': '1.1' if i < 3 else '2.1',
+        'wbs_level_0': 'P',
+        'wbs_level_1': '1' if i < 3 else '2',
+        'wbs_level_2': '1.1' if i < 3 else '2.1',
+        'Total Float': 5.0
+    })
+activities[3]['Activity Status'] = 'Completed'
+activities[5]['Activity Status'] = 'Not Started'
+
+schedule_data = {'activities': activities}
+frame = pd.DataFrame(activities)
+
+print("Step 1: Running DCMA analysis")
+analyzer = DCMAAnalyzer(schedule_data, df=frame)
+metrics = analyzer.analyze()['metrics']
+print("✅ Analysis complete")
+print()
+
+all_passed = True
+
+
+def check(label, actual, expected):
+    """Compare key order of a distribution with value_counts on the original values"""
+    global all_passed
+    if list(actual) == list(expected):
+        print(f"✅ {label}: {list(actual)}")
+    else:
+        print(f"❌ {label}: {list(actual)} (expected {list(expected)})")
+        all_passed = False
+
+
+print("Step 2: Checking distribution order")
+check('activity_status.distribution', metrics['activity_status']['distribution'],
+      frame['Activity Status'].value_counts().to_dict())
+check('activity_types.distribution', metrics['activity_types']['distribution'],
+      frame['Activity Type'].value_counts().to_dict())
+
+for level_key, level_col in (('level_1_phases', 'wbs_level_1'), ('level_2_areas', 'wbs_level_2')):
+    for code, stats in metrics['wbs_analysis'][level_key].items():
+        area = frame[frame[level_col] == code]
+        check(f"{level_key}['{code}'].status_distribution", stats['status_distribution'],
+              area['Activity Status'].value_counts().to_dict())
+
+# The caller's frame keeps its own dtypes
+check('caller frame dtypes', [str(frame['Activity Status'].dtype)], ['object'])
+print()
+
+if not all_passed:
+    print("❌ Distribution order test FAILED")
+    exit(1)
+
+print("✅ All distribution order checks passed")